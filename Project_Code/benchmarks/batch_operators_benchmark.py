@@ -0,0 +1,66 @@
+import sys
+import time
+from copy import copy
+from random import Random
+
+from ga.genetic_operators.mutation_insert import MutationInsert
+from ga.genetic_operators.mutation_psm import MutationPSM
+from ga.genetic_operators.mutation_rsm import MutationRSM
+from ga.genetic_operators.recombination_cx import RecombinationCX
+from ga.genetic_operators.recombination_ox1 import RecombinationOX1
+from ga.genetic_operators.recombination_pmx import RecombinationPMX
+from ga.population import Population
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Per individual operators against their batch versions on copies of the same population, timing only.
+# tests/test_batch_operators.py checks the children and their distributions.
+# Run from Project_Code: python -m benchmarks.batch_operators_benchmark [data set file]
+
+POPULATION_SIZE = 2000
+REPEATS = 5
+
+OPERATORS = [RecombinationPMX(1), RecombinationOX1(1), RecombinationCX(1),
+             MutationInsert(1), MutationRSM(1), MutationPSM(0.2)]
+
+
+def copy_population(population: Population) -> Population:
+    new_population = Population(population.size)
+    new_population.individuals = [copy(ind) for ind in population.individuals]
+    return new_population
+
+
+def run_operator(operator, population: Population, batch: bool) -> float:
+    seconds = 0
+    rand = Random(1)
+    for _ in range(REPEATS):
+        new_population = copy_population(population)
+        start = time.perf_counter()
+        if batch:
+            operator.run_batch(new_population, rand)
+        else:
+            operator.run(new_population, rand)
+        seconds += time.perf_counter() - start
+    return seconds / REPEATS
+
+
+def main(filename: str) -> None:
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    agent_search = WarehouseAgentSearch(WarehouseState(matrix, num_rows, num_columns))
+    agent_search.calculate_pairs_distances(True)
+    problem = WarehouseProblemGA(agent_search)
+
+    population = Population(POPULATION_SIZE, problem, Random(1))
+    population.evaluate()
+
+    print(f'{filename}: {population.individuals[0].num_genes} genes, {POPULATION_SIZE} individuals')
+    print(f'{"Operator":>12}{"Loop ms":>10}{"Batch ms":>10}{"Speedup":>10}')
+    for operator in OPERATORS:
+        loop = run_operator(operator, population, False)
+        batch = run_operator(operator, population, True)
+        print(f'{str(operator):>12}{loop * 1000:>10.2f}{batch * 1000:>10.2f}{loop / batch:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else './data_sets/problem5.txt')
@@ -0,0 +1,87 @@
+import sys
+import threading
+import time
+
+from ga.genetic_algorithm import GeneticAlgorithm, spawn_seeds
+from ga.genetic_operators.mutation_insert import MutationInsert
+from ga.genetic_operators.recombination_pmx import RecombinationPMX
+from ga.selection_methods.tournament import Tournament
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Runs of one experiment sharing a problem, one after the other and then all at once in threads.
+# Every run must have the same best and average fitness history both ways, with and without collision checks.
+# Run from Project_Code: python -m benchmarks.concurrent_runs_benchmark [data set file]
+
+RUNS = 4
+POPULATION_SIZE = 50
+MAX_GENERATIONS = 50
+
+
+class HistoryListener:
+
+    def __init__(self):
+        self.history = []
+
+    def generation_ended(self, event) -> None:
+        self.history.append((event.best.fitness, event.average_fitness))
+
+    def run_ended(self, event) -> None:
+        pass
+
+
+def create_runs(problem: WarehouseProblemGA, seeds: [int]) -> ([GeneticAlgorithm], [HistoryListener]):
+    runs = []
+    listeners = []
+    for seed in seeds:
+        ga = GeneticAlgorithm(seed, POPULATION_SIZE, MAX_GENERATIONS, Tournament(2), RecombinationPMX(0.7),
+                              MutationInsert(0.1))
+        ga.problem = problem
+        listener = HistoryListener()
+        ga.add_listener(listener)
+        runs.append(ga)
+        listeners.append(listener)
+    return runs, listeners
+
+
+def run_sequential(problem: WarehouseProblemGA, seeds: [int]) -> ([list], float):
+    runs, listeners = create_runs(problem, seeds)
+    start = time.perf_counter()
+    for ga in runs:
+        ga.run()
+    return [listener.history for listener in listeners], time.perf_counter() - start
+
+
+def run_threads(problem: WarehouseProblemGA, seeds: [int]) -> ([list], float):
+    runs, listeners = create_runs(problem, seeds)
+    threads = [threading.Thread(target=ga.run) for ga in runs]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [listener.history for listener in listeners], time.perf_counter() - start
+
+
+def main(filename: str) -> None:
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    seeds = spawn_seeds(1, RUNS)
+
+    print(f'{filename}: {RUNS} runs, population {POPULATION_SIZE}, {MAX_GENERATIONS} generations')
+    print(f'{"Collisions":>12}{"Sequential s":>14}{"Threads s":>12}{"Best fitness":>30}')
+    for allow_collisions in (True, False):
+        agent_search = WarehouseAgentSearch(
+            WarehouseState(matrix, num_rows, num_columns, allow_collisions=allow_collisions))
+        agent_search.calculate_pairs_distances(True)
+        problem = WarehouseProblemGA(agent_search)
+
+        sequential, sequential_seconds = run_sequential(problem, seeds)
+        threads, threads_seconds = run_threads(problem, seeds)
+        assert sequential == threads, 'concurrent runs changed a history'
+        best = [history[-1][0] for history in sequential]
+        print(f'{str(allow_collisions):>12}{sequential_seconds:>14.2f}{threads_seconds:>12.2f}{str(best):>30}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else './data_sets/problem5.txt')
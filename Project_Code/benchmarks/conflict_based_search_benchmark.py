@@ -0,0 +1,62 @@
+import sys
+import time
+from random import Random
+
+from benchmarks.space_time_replanning_benchmark import count_collisions
+from warehouse.conflict_based_search import ConflictBasedSearch
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Conflict free plans of the routes of random individuals, with CBS and ECBS, against the collision check simulation.
+# Reports the plans found within the time limit, their mean cost and makespan, and the mean fitness the
+# simulation gives the same individuals (with 999 penalties). Every plan is replayed to check it has no collisions.
+# Run from Project_Code: python -m benchmarks.conflict_based_search_benchmark [data set files]
+
+INDIVIDUALS = 20
+SEED = 1
+TIME_LIMIT = 2
+SUBOPTIMALITIES = (1, 1.2, 2)
+
+
+def main(filenames: [str]) -> None:
+    print(f'{INDIVIDUALS} random individuals per data set, {TIME_LIMIT}s per plan')
+    print(f'{"Data set":>30}{"Planner":>12}{"Plans":>7}{"Cost":>9}{"Simulation":>12}{"Makespan":>10}'
+          f'{"Max s":>8}')
+    for filename in filenames:
+        matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+        agent_search = WarehouseAgentSearch(
+            WarehouseState(matrix, num_rows, num_columns, allow_collisions=False))
+        agent_search.calculate_pairs_distances(True)
+        problem = WarehouseProblemGA(agent_search)
+        rand = Random(SEED)
+        individuals = [problem.generate_individual(rand) for _ in range(INDIVIDUALS)]
+        simulation = [ind.compute_fitness() for ind in individuals]
+
+        for suboptimality in SUBOPTIMALITIES:
+            planner = ConflictBasedSearch(agent_search, suboptimality, TIME_LIMIT)
+            costs = []
+            simulated = []
+            makespans = []
+            max_seconds = 0
+            for ind, fitness in zip(individuals, simulation):
+                start = time.perf_counter()
+                forklifts_actions = planner.solve(ind)
+                max_seconds = max(max_seconds, time.perf_counter() - start)
+                if forklifts_actions is None:
+                    continue
+                assert count_collisions(agent_search, forklifts_actions) == 0, 'a plan has a collision'
+                costs.append(planner.cost)
+                simulated.append(fitness)
+                makespans.append(planner.makespan)
+
+            solved = len(costs)
+            cost = sum(costs) / solved if solved else 0
+            simulation_cost = sum(simulated) / solved if solved else 0
+            makespan = sum(makespans) / solved if solved else 0
+            print(f'{filename:>30}{str(planner):>12}{solved:>7}{cost:>9.1f}{simulation_cost:>12.1f}{makespan:>10.1f}'
+                  f'{max_seconds:>8.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [f'./data_sets/problem{i}.txt' for i in range(1, 7)])
@@ -0,0 +1,44 @@
+import sys
+import time
+
+from search_methods.astar_search import AStarSearch
+from utils.node_lazy_priority_queue import NodeLazyPriorityQueue
+from utils.node_priority_queue import NodePriorityQueue
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_state import WarehouseState
+
+# Expanded nodes per second of the pair searches, for each frontier implementation.
+# Run from Project_Code: python -m benchmarks.frontier_benchmark [data set files]
+
+
+def run(filename: str, collection_type: type) -> (int, float):
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    agent_search = WarehouseAgentSearch(WarehouseState(matrix, num_rows, num_columns))
+    agent_search.search_method = AStarSearch(collection_type)
+
+    expanded_nodes = 0
+    original_solve_problem = agent_search.solve_problem
+
+    def solve_problem(problem):
+        nonlocal expanded_nodes
+        solution = original_solve_problem(problem)
+        expanded_nodes += agent_search.search_method.num_expanded_nodes
+        return solution
+
+    agent_search.solve_problem = solve_problem
+    start = time.perf_counter()
+    agent_search.calculate_pairs_distances()
+    return expanded_nodes, time.perf_counter() - start
+
+
+def main(filenames: [str]) -> None:
+    print(f'{"Data set":<28}{"Frontier":<24}{"Expanded":>10}{"Seconds":>10}{"Nodes/s":>12}')
+    for filename in filenames:
+        for collection_type in (NodePriorityQueue, NodeLazyPriorityQueue):
+            expanded_nodes, elapsed = run(filename, collection_type)
+            print(f'{filename:<28}{collection_type.__name__:<24}{expanded_nodes:>10}{elapsed:>10.3f}'
+                  f'{expanded_nodes / elapsed:>12.0f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [f'./data_sets/problem{i}.txt' for i in range(1, 7)])
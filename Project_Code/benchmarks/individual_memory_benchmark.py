@@ -0,0 +1,48 @@
+import sys
+import time
+import tracemalloc
+from copy import copy
+from random import Random
+
+from ga.population import Population
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Memory held by a population of individuals, and the time to copy them with a private genome each.
+# Run from Project_Code: python -m benchmarks.individual_memory_benchmark [data set file]
+
+POPULATION_SIZES = [100, 1000, 5000]
+
+
+def measure_population(problem: WarehouseProblemGA, population_size: int) -> (int, float):
+    rand = Random(1)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    population = Population(population_size, problem, rand)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+    start = time.perf_counter()
+    for ind in population.individuals:
+        copy(ind).own_genome()
+    return size, time.perf_counter() - start
+
+
+def main(filename: str) -> None:
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    agent_search = WarehouseAgentSearch(WarehouseState(matrix, num_rows, num_columns))
+    agent_search.calculate_pairs_distances(True)
+    problem = WarehouseProblemGA(agent_search)
+
+    num_genes = len(agent_search.products) + len(agent_search.forklifts) - 1
+    print(f'{filename}: {num_genes} genes')
+    print(f'{"Population":>10}{"KiB":>10}{"Bytes/ind":>12}{"Copy ms":>10}')
+    for population_size in POPULATION_SIZES:
+        size, seconds = measure_population(problem, population_size)
+        print(f'{population_size:>10}{size / 1024:>10.1f}{size / population_size:>12.0f}{seconds * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else './data_sets/problem5.txt')
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+import constants
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_state import WarehouseState
+
+# Pair distances of a data set tiled tiles x tiles times, serial and in process pools of growing size, for the
+# searches and the distance fields. Tiles keep their forklifts and products, only the first exit is kept.
+# Every pool must give the values of the serial run. The pool only pays off with more than one CPU.
+# Run from Project_Code: python -m benchmarks.pairs_pool_benchmark [tiles] [data set file]
+
+
+def build_tiled_state(filename: str, tiles: int) -> WarehouseState:
+    matrix, _, _ = read_state_from_txt_file(filename)
+    matrix = np.tile(matrix, (tiles, tiles))
+    exits = np.argwhere(matrix == constants.EXIT)
+    for line, column in exits[1:]:
+        matrix[line, column] = constants.EMPTY
+    return WarehouseState(matrix, matrix.shape[0], matrix.shape[1])
+
+
+def run(state: WarehouseState, use_distance_fields: bool, workers: int) -> (list, float):
+    agent_search = WarehouseAgentSearch(state)
+    start = time.perf_counter()
+    agent_search.calculate_pairs_distances(use_distance_fields, workers)
+    return [pair.value for pair in agent_search.pairs], time.perf_counter() - start
+
+
+def main(tiles: int, filename: str) -> None:
+    state = build_tiled_state(filename, tiles)
+    workers_counts = sorted({2, 4, os.cpu_count()} - {1})
+    pairs = len(WarehouseAgentSearch(state).pairs)
+    print(f'{filename} tiled {tiles}x{tiles}: {state.rows}x{state.columns} cells, {pairs} pairs, '
+          f'{os.cpu_count()} CPUs')
+    print(f'{"Mode":>8}{"Workers":>9}{"Seconds":>10}{"Speedup":>10}')
+    for use_distance_fields in (False, True):
+        mode = 'fields' if use_distance_fields else 'search'
+        serial_values, serial_seconds = run(state, use_distance_fields, 1)
+        print(f'{mode:>8}{1:>9}{serial_seconds:>10.2f}{1:>10.1f}')
+        for workers in workers_counts:
+            values, seconds = run(state, use_distance_fields, workers)
+            assert values == serial_values, 'the pool changed a pair value'
+            print(f'{mode:>8}{workers:>9}{seconds:>10.2f}{serial_seconds / seconds:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2,
+         sys.argv[2] if len(sys.argv) > 2 else './data_sets/problem5.txt')
@@ -0,0 +1,70 @@
+import sys
+import time
+
+from ga.genetic_algorithm import GeneticAlgorithm, spawn_seeds
+from ga.genetic_operators.mutation_insert import MutationInsert
+from ga.genetic_operators.recombination_pmx import RecombinationPMX
+from ga.selection_methods.tournament import Tournament
+from warehouse.path_cache import PathCache
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# GA runs with collision checks, replanning searches always done and memoized in a path cache.
+# Every run must have the same best and average fitness history both ways.
+# Run from Project_Code: python -m benchmarks.path_cache_benchmark [data set files]
+
+RUNS = 2
+POPULATION_SIZE = 50
+MAX_GENERATIONS = 50
+PATH_CACHE_SIZE = 10000
+
+
+class HistoryListener:
+
+    def __init__(self):
+        self.history = []
+
+    def generation_ended(self, event) -> None:
+        self.history.append((event.best.fitness, event.average_fitness))
+
+    def run_ended(self, event) -> None:
+        pass
+
+
+def run(problem: WarehouseProblemGA, seeds: [int]) -> ([list], float):
+    histories = []
+    start = time.perf_counter()
+    for seed in seeds:
+        ga = GeneticAlgorithm(seed, POPULATION_SIZE, MAX_GENERATIONS, Tournament(2), RecombinationPMX(0.7),
+                              MutationInsert(0.1))
+        ga.problem = problem
+        listener = HistoryListener()
+        ga.add_listener(listener)
+        ga.run()
+        histories.append(listener.history)
+    return histories, time.perf_counter() - start
+
+
+def main(filenames: [str]) -> None:
+    seeds = spawn_seeds(1, RUNS)
+    print(f'{RUNS} runs, population {POPULATION_SIZE}, {MAX_GENERATIONS} generations, cache of {PATH_CACHE_SIZE}')
+    print(f'{"Data set":>30}{"No cache s":>12}{"Cache s":>10}{"Lookups":>10}{"Hit rate":>10}')
+    for filename in filenames:
+        matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+        agent_search = WarehouseAgentSearch(
+            WarehouseState(matrix, num_rows, num_columns, allow_collisions=False))
+        agent_search.calculate_pairs_distances(True)
+        problem = WarehouseProblemGA(agent_search)
+
+        searched, searched_seconds = run(problem, seeds)
+        agent_search.path_cache = PathCache(PATH_CACHE_SIZE)
+        cached, cached_seconds = run(problem, seeds)
+        assert searched == cached, 'the path cache changed a history'
+        path_cache = agent_search.path_cache
+        print(f'{filename:>30}{searched_seconds:>12.2f}{cached_seconds:>10.2f}{path_cache.hits + path_cache.misses:>10}'
+              f'{path_cache.get_hit_rate():>10.1%}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [f'./data_sets/problem{i}.txt' for i in range(3, 7)])
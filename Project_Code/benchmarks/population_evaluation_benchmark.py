@@ -0,0 +1,44 @@
+import sys
+import time
+from random import Random
+
+from ga.population import Population
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Collision free evaluation of a whole population, one individual at a time against the batched NumPy evaluator.
+# Run from Project_Code: python -m benchmarks.population_evaluation_benchmark [data set file]
+
+POPULATION_SIZES = [50, 100, 200, 500, 1000]
+REPEATS = 20
+
+
+def time_evaluation(population: Population, batch: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for ind in population.individuals:
+            ind.dirty = True
+        population.evaluate(batch)
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main(filename: str) -> None:
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    agent_search = WarehouseAgentSearch(WarehouseState(matrix, num_rows, num_columns))
+    agent_search.calculate_pairs_distances(True)
+    problem = WarehouseProblemGA(agent_search)
+
+    print(f'{filename}: {len(agent_search.products)} products, {len(agent_search.forklifts)} forklifts')
+    print(f'{"Population":>10}{"Loop ms":>12}{"Batch ms":>12}{"Speedup":>10}')
+    for population_size in POPULATION_SIZES:
+        population = Population(population_size, problem, Random(1))
+        loop = time_evaluation(population, False)
+        loop_fitness = [ind.fitness for ind in population.individuals]
+        batch = time_evaluation(population, True)
+        assert loop_fitness == [ind.fitness for ind in population.individuals]
+        print(f'{population_size:>10}{loop * 1000:>12.2f}{batch * 1000:>12.2f}{loop / batch:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else './data_sets/problem5.txt')
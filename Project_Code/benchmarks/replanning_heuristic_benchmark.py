@@ -0,0 +1,87 @@
+import sys
+import time
+from random import Random
+
+from search_methods.astar_search import AStarSearch
+from warehouse.heuristic_target_distances import HeuristicTargetDistances
+from warehouse.heuristic_warehouse import HeuristicWarehouse
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_individual import WarehouseIndividual
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
+from warehouse.warehouse_state import WarehouseState
+
+# Replanning searches of the collision check simulations of random individuals, with blocked forklifts replanning
+# around the cells of the others and in space and time, solved with Manhattan distances and with the distances to
+# the targets on the static grid as heuristic. Reports the expanded nodes and seconds of both, every search must
+# find a path of the same cost both ways.
+# Run from Project_Code: python -m benchmarks.replanning_heuristic_benchmark [data set files]
+
+INDIVIDUALS = 200
+SEED = 1
+
+
+class RecordingIndividual(WarehouseIndividual):
+
+    def __init__(self, problem: WarehouseProblemGA, genome: [int], problems: [WarehouseProblemSearch]):
+        super().__init__(problem, len(genome))
+        self.genome = list(genome)
+        self.problems = problems
+        self.forklifts_actions = [[] for _ in range(len(self.agent.forklifts))]
+
+    def solve_search_problem(self, problem: WarehouseProblemSearch, search_method: AStarSearch = None):
+        self.problems.append(problem)
+        return super().solve_search_problem(problem, search_method)
+
+
+def solve(problems: [WarehouseProblemSearch], heuristic_class, *args) -> ([float | None], int, float):
+    costs = []
+    expanded_nodes = 0
+    start = time.perf_counter()
+    for problem in problems:
+        heuristic = heuristic_class(*args)
+        heuristic.problem = problem
+        problem.heuristic = heuristic
+        search_method = AStarSearch()
+        solution = search_method.search(problem)
+        costs.append(solution.cost if solution else None)
+        expanded_nodes += search_method.num_expanded_nodes
+    return costs, expanded_nodes, time.perf_counter() - start
+
+
+def main(filenames: [str]) -> None:
+    print(f'{INDIVIDUALS} random individuals per data set')
+    print(f'{"Data set":>30}{"Replanning":>12}{"Searches":>10}{"Manhattan":>11}{"Distances":>11}{"Saved":>8}'
+          f'{"Manhattan s":>13}{"Distances s":>13}')
+    for filename in filenames:
+        matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+        agent_search = WarehouseAgentSearch(
+            WarehouseState(matrix, num_rows, num_columns, allow_collisions=False))
+        agent_search.calculate_pairs_distances(True)
+        problem = WarehouseProblemGA(agent_search)
+        rand = Random(SEED)
+        genomes = [problem.generate_individual(rand).genome for _ in range(INDIVIDUALS)]
+
+        for space_time_replanning in (False, True):
+            agent_search.space_time_replanning = space_time_replanning
+            problems = []
+            for genome in genomes:
+                RecordingIndividual(problem, genome, problems).compute_fitness_with_collision_check()
+
+            manhattan_costs, manhattan_nodes, manhattan_seconds = solve(problems, HeuristicWarehouse)
+            # Fields of the targets are built once per data set, outside the timed searches
+            for search_problem in problems:
+                agent_search.get_target_distances(search_problem.goal_position)
+            distance_costs, distance_nodes, distance_seconds = solve(problems, HeuristicTargetDistances,
+                                                                     agent_search)
+            assert all(distance_cost is None if manhattan_cost is None else distance_cost <= manhattan_cost
+                       for manhattan_cost, distance_cost in zip(manhattan_costs, distance_costs)), \
+                'a path got longer'
+            saved = 1 - distance_nodes / manhattan_nodes if manhattan_nodes else 0
+            mode = 'space-time' if space_time_replanning else 'cells'
+            print(f'{filename:>30}{mode:>12}{len(problems):>10}{manhattan_nodes:>11}{distance_nodes:>11}'
+                  f'{saved:>8.1%}{manhattan_seconds:>13.2f}{distance_seconds:>13.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [f'./data_sets/problem{i}.txt' for i in range(1, 7)])
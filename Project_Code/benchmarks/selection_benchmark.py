@@ -0,0 +1,54 @@
+import sys
+import time
+import tracemalloc
+from random import Random
+
+from ga.population import Population
+from ga.selection_methods.tournament import Tournament
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Memory blocks and bytes still allocated after one tournament selection, and its time.
+# Run from Project_Code: python -m benchmarks.selection_benchmark [data set file]
+
+POPULATION_SIZES = [50, 100, 500, 1000]
+REPEATS = 20
+
+
+def measure_selection(population: Population, tournament: Tournament) -> (int, int, float):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    rand = Random(1)
+    new_population = tournament.run(population, rand)  # kept alive until the snapshot
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    statistics = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in statistics)
+    size = sum(stat.size_diff for stat in statistics)
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        tournament.run(population, rand)
+    return blocks, size, (time.perf_counter() - start) / REPEATS
+
+
+def main(filename: str) -> None:
+    matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+    agent_search = WarehouseAgentSearch(WarehouseState(matrix, num_rows, num_columns))
+    agent_search.calculate_pairs_distances(True)
+    problem = WarehouseProblemGA(agent_search)
+    tournament = Tournament(2)
+
+    print(f'{filename}: {len(agent_search.products)} products, {len(agent_search.forklifts)} forklifts')
+    print(f'{"Population":>10}{"Blocks":>10}{"KiB":>10}{"ms":>10}')
+    for population_size in POPULATION_SIZES:
+        population = Population(population_size, problem, Random(1))
+        population.evaluate()
+        blocks, size, seconds = measure_selection(population, tournament)
+
+        print(f'{population_size:>10}{blocks:>10}{size / 1024:>10.1f}{seconds * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else './data_sets/problem5.txt')
@@ -0,0 +1,73 @@
+import sys
+import time
+from random import Random
+
+import constants
+from warehouse.action_path import MOVE_CODES, MOVE_COLUMNS, MOVE_LINES
+from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
+from warehouse.warehouse_individual import WarehouseIndividual
+from warehouse.warehouse_problemforGA import WarehouseProblemGA
+from warehouse.warehouse_state import WarehouseState
+
+# Collision check simulation of random individuals with blocked forklifts replanning around the current cells of
+# the others and replanning in space and time around their plans.
+# Reports the individuals with the 999 penalty and the mean fitness of the others, and replays every solution
+# round by round to check that no forklift ever drives into another one.
+# Run from Project_Code: python -m benchmarks.space_time_replanning_benchmark [data set files]
+
+INDIVIDUALS = 200
+SEED = 1
+
+
+def count_collisions(agent_search: WarehouseAgentSearch, forklifts_actions: list) -> int:
+    positions = [(forklift.line, forklift.column) for forklift in agent_search.forklifts]
+    exit_cell = (agent_search.exit.line, agent_search.exit.column)
+    collisions = 0
+    for step in range(max(len(actions) for actions in forklifts_actions)):
+        for i, actions in enumerate(forklifts_actions):
+            if step >= len(actions):
+                continue
+            code = MOVE_CODES[type(actions[step])]
+            target = (positions[i][0] + int(MOVE_LINES[code]), positions[i][1] + int(MOVE_COLUMNS[code]))
+            if target != positions[i] and (target != exit_cell and target in positions or
+                                           agent_search.grid[target] not in (constants.EMPTY, constants.EXIT)):
+                collisions += 1
+            positions[i] = target
+    return collisions
+
+
+def simulate(individuals: [WarehouseIndividual]) -> ([int], int, float):
+    fitness_values = []
+    collisions = 0
+    start = time.perf_counter()
+    for ind in individuals:
+        ind.forklifts_actions = [[] for _ in range(len(ind.agent.forklifts))]
+        fitness_values.append(ind.compute_fitness_with_collision_check())
+        collisions += count_collisions(ind.agent, ind.forklifts_actions)
+    return fitness_values, collisions, time.perf_counter() - start
+
+
+def main(filenames: [str]) -> None:
+    print(f'{INDIVIDUALS} random individuals per data set')
+    print(f'{"Data set":>30}{"Replanning":>12}{"Penalised":>11}{"Mean fitness":>14}{"Seconds":>10}')
+    for filename in filenames:
+        matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+        agent_search = WarehouseAgentSearch(
+            WarehouseState(matrix, num_rows, num_columns, allow_collisions=False))
+        agent_search.calculate_pairs_distances(True)
+        problem = WarehouseProblemGA(agent_search)
+        rand = Random(SEED)
+        individuals = [problem.generate_individual(rand) for _ in range(INDIVIDUALS)]
+
+        for space_time_replanning in (False, True):
+            agent_search.space_time_replanning = space_time_replanning
+            fitness_values, collisions, seconds = simulate(individuals)
+            assert collisions == 0, 'a forklift drove into another one'
+            solved = [fitness for fitness in fitness_values if fitness < 999]
+            mean = sum(solved) / len(solved) if solved else 0
+            mode = 'space-time' if space_time_replanning else 'cells'
+            print(f'{filename:>30}{mode:>12}{len(fitness_values) - len(solved):>11}{mean:>14.1f}{seconds:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or [f'./data_sets/problem{i}.txt' for i in range(1, 7)])
@@ -84,3 +84,8 @@ class ExperimentsFactory(ABC):
 
     def get_parameter_value(self, parameter_name: str) -> str:
         return self.parameters.get(parameter_name).get_active_value()
+
+    def is_parameter_enabled(self, parameter_name: str) -> bool:
+        if not self.contains_parameter(parameter_name):
+            return False
+        return self.get_parameter_value(parameter_name).lower() in ('y', 'yes', 't', 'true', 'on', '1')
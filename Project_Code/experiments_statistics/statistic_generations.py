@@ -0,0 +1,36 @@
+import os
+
+from experiments.experiment_event import ExperimentEvent
+from experiments.experiment_listener import ExperimentListener
+from ga.ga_event import GAEvent
+from ga.ga_listener import GAListener
+
+
+class StatisticGenerations(GAListener, ExperimentListener):
+    # One line per generation of every run, the fitness cache counts are since the start of the run and the local
+    # search ones for the generation
+
+    def __init__(self, experiment_header: str):
+        self.lines = []
+        self.run = 1
+        self.generation = 0
+        if not os.path.isfile('statistic_generations.xls'):
+            with open('statistic_generations.xls', 'a+') as file:
+                file.write(experiment_header + '\tRun:\tGeneration:\tBest:\tAverage:\tCache hits:\tCache misses:'
+                           '\tLocal search improved:\tLocal search gain:\n')
+
+    def generation_ended(self, ga_event: GAEvent) -> None:
+        self.lines.append([self.run, self.generation, ga_event.best.fitness, ga_event.average_fitness,
+                           ga_event.cache_hits, ga_event.cache_misses, ga_event.local_search_improved,
+                           ga_event.local_search_gain])
+        self.generation += 1
+
+    def run_ended(self, ga_event: GAEvent) -> None:
+        self.run += 1
+        self.generation = 0
+
+    def experiment_ended(self, experiment_event: ExperimentEvent) -> None:
+        with open('statistic_generations.xls', 'a') as file:
+            for line in self.lines:
+                file.write(experiment_event.experiment.experiment_values + '\t' +
+                           '\t'.join(str(value) for value in line) + '\n')
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+# Fitness of already evaluated genomes, the least recently used entries are dropped past max_size.
+# Keys are the genome bytes, 2 bytes per gene against 8 for a tuple.
+# GA runs in threads of the same problem share the cache, each one counts the hits and misses of its own calls.
+# Worker processes start with an empty one.
+
+
+class FitnessCache:
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def get_key(individual: "Individual") -> bytes:
+        return individual.genome.tobytes()
+
+    def evaluate(self, individuals: list, evaluate_misses: Callable[[list], None]) -> (int, int):
+        # Hits and misses of this call, genomes repeated in the same population are only evaluated once
+        hits = 0
+        misses = {}
+        with self.lock:
+            for ind in individuals:
+                key = self.get_key(ind)
+                fitness = self.entries.get(key)
+                if fitness is not None:
+                    self.entries.move_to_end(key)
+                    ind.set_fitness(fitness)
+                    hits += 1
+                elif key in misses:
+                    misses[key].append(ind)
+                    hits += 1
+                else:
+                    misses[key] = [ind]
+            self.hits += hits
+            self.misses += len(misses)
+
+        if not misses:
+            return hits, 0
+
+        evaluate_misses([same_genome[0] for same_genome in misses.values()])
+        with self.lock:
+            for key, same_genome in misses.items():
+                fitness = same_genome[0].fitness
+                for ind in same_genome[1:]:
+                    ind.set_fitness(fitness)
+                self.put(key, fitness)
+        return hits, len(misses)
+
+    def put(self, key: bytes, fitness: float) -> None:
+        # Callers hold the lock
+        self.entries[key] = fitness
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        return self.max_size
+
+    def __setstate__(self, max_size: int):
+        self.__init__(max_size)
@@ -3,7 +3,19 @@ from ga.individual import Individual
 
 class GAEvent:
 
-    def __init__(self, best: Individual, average_fitness: float, run_ended: bool = False):
+    def __init__(self, best: Individual, average_fitness: float, run_ended: bool = False,
+                 cache_hits: int = 0, cache_misses: int = 0, skipped_evaluations: int = 0,
+                 local_search_improved: int = 0, local_search_gain: float = 0, termination_reason: str = None):
         self.best = best
         self.average_fitness = average_fitness
         self.run_ended = run_ended
+        # Fitness cache lookups since the start of the run, hits are evaluations saved
+        self.cache_hits = cache_hits
+        self.cache_misses = cache_misses
+        # Individuals of the last generation that kept their fitness
+        self.skipped_evaluations = skipped_evaluations
+        # Individuals the local search improved in the last generation, and the fitness they gained together
+        self.local_search_improved = local_search_improved
+        self.local_search_gain = local_search_gain
+        # Why the run ended, only set in the run ended event
+        self.termination_reason = termination_reason
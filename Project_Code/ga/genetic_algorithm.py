@@ -1,13 +1,24 @@
 from copy import copy
 from random import Random
 
+import numpy as np
+
 from ga.ga_event import GAEvent
 from ga.population import Population
+from ga.population_pool import PopulationPool
 from ga.selection_methods.selection_method import SelectionMethod
 
+# Reasons a run ends besides its termination criteria
+MAX_GENERATIONS = 'Max generations'
+STOPPED = 'Stopped'
+
+
+def spawn_seeds(seed: int, count: int) -> [int]:
+    # Independent seeds for runs of the same experiment or islands of the same run, see numpy SeedSequence
+    return [int(child.generate_state(1, np.uint64)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
+
 
 class GeneticAlgorithm:
-    rand = None
 
     def __init__(self,
                  seed: int,
@@ -16,7 +27,8 @@ class GeneticAlgorithm:
                  selection_method: SelectionMethod,
                  recombination: "Recombination",
                  mutation: "Mutation"):
-        GeneticAlgorithm.rand = Random(seed)
+        # Every random choice of a run comes from this generator, runs do not share state
+        self.rand = Random(seed)
         self.population_size = population_size
         self.max_generations = max_generations
         self.selection_method = selection_method
@@ -27,6 +39,24 @@ class GeneticAlgorithm:
         self.stopped = False
         self.best_in_run = None
         self.problem = None
+        self.batch_evaluation = False
+        # Recombination and mutation over a genome matrix, same distributions but other random draws
+        self.batch_operators = False
+        # Optional memetic stage after each generation, see ga.local_search
+        self.local_search = None
+        # 1 evaluates in this process, None uses one worker per cpu
+        self.evaluation_workers = 1
+        self.evaluation_pool = None
+        # Genomes kept in the problem fitness cache, 0 disables it
+        self.fitness_cache_size = 0
+        self.fitness_cache = None
+        # Any criterion ends the run before max_generations, see ga.termination_criteria
+        self.termination_criteria = []
+        self.termination_reason = None
+        # Fitness computations and fitness cache lookups since the start of the run
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.listeners = []
 
     def stop(self) -> None:
@@ -36,22 +66,85 @@ class GeneticAlgorithm:
         if self.problem is None:
             return None
 
+        self.start_run()
+        try:
+            self.evolve()
+        finally:
+            self.end_run()
+
+    def start_run(self) -> None:
+        self.fitness_cache = None
+        if self.fitness_cache_size > 0:
+            self.fitness_cache = self.problem.get_fitness_cache(self.fitness_cache_size)
+
+        if self.evaluation_workers != 1:
+            self.evaluation_pool = PopulationPool(self.problem, self.evaluation_workers)
+
+    def end_run(self) -> None:
+        if self.evaluation_pool is not None:
+            self.evaluation_pool.close()
+            self.evaluation_pool = None
+
+    def evolve(self) -> None:
+        self.start_termination_criteria()
+        self.initialize_population()
+        while not self.is_terminated():
+            self.next_generation()
+        self.fire_run_ended()
+
+    def start_termination_criteria(self) -> None:
+        self.termination_reason = None
+        for criterion in self.termination_criteria:
+            criterion.start(self)
+
+    def is_terminated(self) -> bool:
+        if self.stopped:
+            self.termination_reason = STOPPED
+        elif self.generation >= self.max_generations:
+            self.termination_reason = MAX_GENERATIONS
+        else:
+            for criterion in self.termination_criteria:
+                if criterion.reached(self):
+                    self.termination_reason = str(criterion)
+                    break
+        return self.termination_reason is not None
+
+    def initialize_population(self) -> None:
         self.generation = 0
-        self.population = Population(self.population_size, self.problem)
-        self.population.evaluate()
+        self.population = Population(self.population_size, self.problem, self.rand)
+        self.population.evaluate(self.batch_evaluation, self.evaluation_pool, self.fitness_cache)
+        self.evaluations = self.population.evaluations
+        self.cache_hits = self.population.cache_hits
+        self.cache_misses = self.population.cache_misses
         self.best_in_run = self.population.best_individual
         self.fire_generation_ended()
 
-        while self.generation < self.max_generations and not self.stopped:
-            self.population = self.selection_method.run(self.population)
-            self.recombination_method.run(self.population)
-            self.mutation_method.run(self.population)
-            self.population.evaluate()
-            if self.population.best_individual.better_than(self.best_in_run):
-                self.best_in_run = copy(self.population.best_individual)
-            self.generation += 1
-            self.fire_generation_ended()
-        self.fire_run_ended()
+    def next_generation(self) -> None:
+        self.population = self.selection_method.run(self.population, self.rand)
+        if self.batch_operators:
+            self.recombination_method.run_batch(self.population, self.rand)
+            self.mutation_method.run_batch(self.population, self.rand)
+        else:
+            self.recombination_method.run(self.population, self.rand)
+            self.mutation_method.run(self.population, self.rand)
+        self.population.evaluate(self.batch_evaluation, self.evaluation_pool, self.fitness_cache)
+        self.evaluations += self.population.evaluations
+        self.cache_hits += self.population.cache_hits
+        self.cache_misses += self.population.cache_misses
+        if self.local_search is not None:
+            self.local_search.run(self.population, self.generation + 1, self.rand)
+            self.evaluations += self.local_search.evaluations
+            # Evaluates the individuals the local search left dirty, and finds the best again
+            skipped_evaluations = self.population.skipped_evaluations
+            self.population.evaluate(self.batch_evaluation, self.evaluation_pool, self.fitness_cache)
+            self.population.skipped_evaluations = skipped_evaluations
+            self.evaluations += self.population.evaluations
+            self.cache_hits += self.population.cache_hits
+            self.cache_misses += self.population.cache_misses
+        if self.population.best_individual.better_than(self.best_in_run):
+            self.best_in_run = copy(self.population.best_individual)
+        self.generation += 1
+        self.fire_generation_ended()
 
     def __str__(self):
         return "GA: \n" + str(self.population)
@@ -61,10 +154,18 @@ class GeneticAlgorithm:
     def add_listener(self, listener):
         self.listeners.append(listener)
 
+    def create_event(self, run_ended: bool = False) -> GAEvent:
+        local_search_improved = local_search_gain = 0
+        if self.local_search is not None:
+            local_search_improved, local_search_gain = self.local_search.improved, self.local_search.gain
+        return GAEvent(copy(self.best_in_run), self.population.average_fitness, run_ended,
+                       self.cache_hits, self.cache_misses, self.population.skipped_evaluations,
+                       local_search_improved, local_search_gain, self.termination_reason if run_ended else None)
+
     def fire_generation_ended(self) -> None:
         for listener in self.listeners:
-            listener.generation_ended(GAEvent(copy(self.best_in_run), self.population.average_fitness))
+            listener.generation_ended(self.create_event())
 
     def fire_run_ended(self) -> None:
         for listener in self.listeners:
-            listener.run_ended(GAEvent(copy(self.best_in_run), self.population.average_fitness, True))
+            listener.run_ended(self.create_event(True))
@@ -1,7 +1,5 @@
 import threading
-from copy import copy
 
-from ga.ga_event import GAEvent
 from ga.genetic_algorithm import GeneticAlgorithm
 from ga.genetic_operators.mutation import Mutation
 from ga.genetic_operators.recombination import Recombination
@@ -42,9 +40,9 @@ class GeneticAlgorithmThread(GeneticAlgorithm, threading.Thread):
     def fire_generation_ended(self) -> None:
         super().fire_generation_ended()
         for listener in self.tkinter_listeners:
-            listener.queue.put(GAEvent(copy(self.best_in_run), self.population.average_fitness))
+            listener.queue.put(self.create_event())
 
     def fire_run_ended(self) -> None:
         super().fire_run_ended()
         for listener in self.tkinter_listeners:
-            listener.queue.put(GAEvent(copy(self.best_in_run), self.population.average_fitness, True))
+            listener.queue.put(self.create_event(True))
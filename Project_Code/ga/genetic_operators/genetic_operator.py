@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from random import Random
+
+import numpy as np
 
 from ga.population import Population
 
@@ -9,5 +12,28 @@ class GeneticOperator(ABC):
         self.probability = probability
 
     @abstractmethod
-    def run(self, population: Population) -> None:
+    def run(self, population: Population, rand: Random) -> None:
+        pass
+
+    @abstractmethod
+    def run_batch(self, population: Population, rand: Random) -> None:
         pass
+
+    @staticmethod
+    def create_batch_rand(rand: Random) -> np.random.Generator:
+        # Seeded from the run generator, batch runs are repeatable for a given seed
+        return np.random.default_rng(rand.getrandbits(64))
+
+    @staticmethod
+    def random_cuts_batch(rand: np.random.Generator, count: int, num_genes: int,
+                          distinct: bool) -> (np.ndarray, np.ndarray):
+        # Sorted cut points as columns, distinct cuts are drawn like the rejection loops of the operators.
+        # A single gene has no distinct cuts, the segment is that gene and operators leave the genomes unchanged
+        if distinct and num_genes < 2:
+            zeros = np.zeros((count, 1), dtype=np.int64)
+            return zeros, zeros
+        cut1 = rand.integers(0, num_genes, count)
+        cut2 = rand.integers(0, num_genes - 1 if distinct else num_genes, count)
+        if distinct:
+            cut2 += cut2 >= cut1
+        return np.minimum(cut1, cut2)[:, None], np.maximum(cut1, cut2)[:, None]
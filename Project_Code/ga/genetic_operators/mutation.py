@@ -1,26 +1,58 @@
 from abc import abstractmethod
+from random import Random
+
+import numpy as np
 
-from ga.genetic_algorithm import GeneticAlgorithm
 from ga.genetic_operators.genetic_operator import GeneticOperator
 from ga.individual import Individual
 from ga.population import Population
 
 
 class Mutation(GeneticOperator):
+    # Mutations that report every change through Individual.genes_swapped / segment_reversed
+    incremental = False
 
     def __init__(self, probability: float):
         super().__init__(probability)
 
-    def run(self, population: Population) -> None:
+    def run(self, population: Population, rand: Random) -> None:
         population_size = len(population.individuals)
         for i in range(population_size):
-            if GeneticAlgorithm.rand.random() < self.probability:
-                self.mutate(population.individuals[i])
+            if rand.random() < self.probability:
+                population.individuals[i].own_genome()
+                self.mutate(population.individuals[i], rand)
+                if not self.incremental:
+                    population.individuals[i].dirty = True
+
+    def run_batch(self, population: Population, rand: Random) -> None:
+        batch_rand = self.create_batch_rand(rand)
+        indexes = np.flatnonzero(batch_rand.random(len(population.individuals)) < self.probability)
+        if len(indexes) == 0:
+            return
+
+        # No incremental fitness here, a batch evaluation of the mutated individuals is cheaper than the hooks
+        population.set_genomes(indexes, self.mutate_batch(population.get_genomes(indexes), batch_rand))
+        for i in indexes:
+            population.individuals[i].dirty = True
+
+    @abstractmethod
+    def mutate(self, individual: Individual, rand: Random) -> None:
+        pass
 
     @abstractmethod
-    def mutate(self, individual: Individual) -> None:
+    def mutate_batch(self, genomes: np.ndarray, rand: np.random.Generator) -> np.ndarray:
         pass
 
+    @staticmethod
+    def reverse_segments_batch(genomes: np.ndarray, rand: np.random.Generator) -> np.ndarray:
+        # Reverses one random segment of every row, two genes at least
+        count, num_genes = genomes.shape
+        cut1, cut2 = GeneticOperator.random_cuts_batch(rand, count, num_genes, True)
+        columns = np.arange(num_genes)
+        inside = (columns >= cut1) & (columns <= cut2)
+        indexes = np.where(inside, cut1 + cut2 - columns, columns)
+        return np.take_along_axis(genomes, indexes, axis=1)
+
     @staticmethod
     def permute(individual: Individual, index1: int, index2: int) -> None:
         aux = individual.genome[index2]
@@ -1,18 +1,26 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.mutation import Mutation
 from ga.individual_int_vector import IntVectorIndividual
 
 
 class MutationInsert(Mutation):
+    incremental = True
+
     def __init__(self, probability):
         super().__init__(probability)
 
-    def mutate(self, ind: IntVectorIndividual) -> None:
+    def mutate(self, ind: IntVectorIndividual, rand: Random) -> None:
         num_genes = len(ind.genome)
-        cut1 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
+        if num_genes < 2:
+            return
+
+        cut1 = rand.randint(0, num_genes - 1)
         cut2 = cut1
         while cut1 == cut2:
-            cut2 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
+            cut2 = rand.randint(0, num_genes - 1)
 
         if cut1 > cut2:
             cut1, cut2 = cut2, cut1
@@ -26,5 +34,10 @@ class MutationInsert(Mutation):
             ind.genome[end_count] = aux
             end_count -= 1
 
+        ind.segment_reversed(cut1, cut2)
+
+    def mutate_batch(self, genomes: np.ndarray, rand: np.random.Generator) -> np.ndarray:
+        return self.reverse_segments_batch(genomes, rand)
+
     def __str__(self):
         return "Insert (" + f'{self.probability}' + ")"
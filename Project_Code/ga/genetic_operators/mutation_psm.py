@@ -1,22 +1,45 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.mutation import Mutation
 from ga.individual_int_vector import IntVectorIndividual
 
 
 class MutationPSM(Mutation):
+    incremental = True
+
     def __init__(self, probability):
         super().__init__(probability)
 
-    def mutate(self, ind: IntVectorIndividual) -> None:
+    def mutate(self, ind: IntVectorIndividual, rand: Random) -> None:
+        # A single gene has no other gene to swap with
+        if ind.num_genes < 2:
+            return
+
         for i in range(ind.num_genes):
-            if GeneticAlgorithm.rand.random() >= self.probability:
+            if rand.random() >= self.probability:
                 continue
 
-            random_index = GeneticAlgorithm.rand.randint(0, ind.num_genes - 1)
+            random_index = rand.randint(0, ind.num_genes - 1)
             while random_index == i:
-                random_index = GeneticAlgorithm.rand.randint(0, ind.num_genes - 1)
+                random_index = rand.randint(0, ind.num_genes - 1)
 
             self.permute(ind, i, random_index)
+            ind.genes_swapped(i, random_index)
+
+    def mutate_batch(self, genomes: np.ndarray, rand: np.random.Generator) -> np.ndarray:
+        # Genes are visited in order like mutate, each step swaps in every row that draws it
+        genomes = genomes.copy()
+        count, num_genes = genomes.shape
+        if num_genes < 2:
+            return genomes
+        for i in range(num_genes):
+            rows = np.flatnonzero(rand.random(count) < self.probability)
+            random_index = rand.integers(0, num_genes - 1, len(rows))
+            random_index += random_index >= i
+            genomes[rows, i], genomes[rows, random_index] = genomes[rows, random_index], genomes[rows, i]
+        return genomes
 
     def __str__(self):
         return "PSM (" + f'{self.probability}' + ")"
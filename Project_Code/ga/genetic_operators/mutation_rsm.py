@@ -1,25 +1,39 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.mutation import Mutation
 from ga.individual_int_vector import IntVectorIndividual
 
 
 class MutationRSM(Mutation):
+    incremental = True
+
     def __init__(self, probability):
         super().__init__(probability)
 
-    def mutate(self, ind: IntVectorIndividual) -> None:
+    def mutate(self, ind: IntVectorIndividual, rand: Random) -> None:
         num_genes = ind.num_genes
-        cut1 = cut2 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
+        if num_genes < 2:
+            return
+
+        cut1 = cut2 = rand.randint(0, num_genes - 1)
         while cut1 == cut2:
-            cut2 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
+            cut2 = rand.randint(0, num_genes - 1)
 
         if cut1 > cut2:
             cut1, cut2 = cut2, cut1
 
+        start, end = cut1, cut2
         while cut1 < cut2:
             self.permute(ind, cut1, cut2)
             cut1 += 1
             cut2 -= 1
 
+        ind.segment_reversed(start, end)
+
+    def mutate_batch(self, genomes: np.ndarray, rand: np.random.Generator) -> np.ndarray:
+        return self.reverse_segments_batch(genomes, rand)
+
     def __str__(self):
         return "RSM (" + f'{self.probability}' + ")"
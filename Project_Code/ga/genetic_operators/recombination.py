@@ -1,6 +1,8 @@
 from abc import abstractmethod
+from random import Random
+
+import numpy as np
 
-from ga.genetic_algorithm import GeneticAlgorithm
 from ga.genetic_operators.genetic_operator import GeneticOperator
 from ga.individual import Individual
 from ga.population import Population
@@ -11,13 +13,35 @@ class Recombination(GeneticOperator):
     def __init__(self, probability: float):
         super().__init__(probability)
 
-    def run(self, population: Population) -> None:
+    def run(self, population: Population, rand: Random) -> None:
         i = 0
         while i < population.size:
-            if GeneticAlgorithm.rand.random() < self.probability:
-                self.recombine(population.individuals[i], population.individuals[i + 1])
+            if rand.random() < self.probability:
+                self.recombine(population.individuals[i], population.individuals[i + 1], rand)
+                population.individuals[i].dirty = population.individuals[i + 1].dirty = True
+                # Recombinations build new genomes for both children
+                population.individuals[i].genome_shared = population.individuals[i + 1].genome_shared = False
             i += 2
 
+    def run_batch(self, population: Population, rand: Random) -> None:
+        # Same pairs and probability as run, all selected pairs are recombined at once
+        batch_rand = self.create_batch_rand(rand)
+        pairs = np.flatnonzero(batch_rand.random(population.size // 2) < self.probability) * 2
+        if len(pairs) == 0:
+            return
+
+        children1, children2 = self.recombine_batch(population.get_genomes(pairs), population.get_genomes(pairs + 1),
+                                                    batch_rand)
+        population.set_genomes(pairs, children1)
+        population.set_genomes(pairs + 1, children2)
+        for i in pairs:
+            population.individuals[i].dirty = population.individuals[i + 1].dirty = True
+
+    @abstractmethod
+    def recombine(self, ind1: Individual, ind2: Individual, rand: Random):
+        pass
+
     @abstractmethod
-    def recombine(self, ind1: Individual, ind2: Individual):
+    def recombine_batch(self, genomes1: np.ndarray, genomes2: np.ndarray,
+                        rand: np.random.Generator) -> (np.ndarray, np.ndarray):
         pass
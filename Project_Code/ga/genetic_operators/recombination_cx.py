@@ -1,4 +1,7 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.recombination import Recombination
 from ga.individual import Individual
 
@@ -8,8 +11,8 @@ class RecombinationCX(Recombination):
     def __init__(self, probability: float):
         super().__init__(probability)
 
-    def recombine(self, ind1: Individual, ind2: Individual) -> None:
-        start_with_ind1 = bool(GeneticAlgorithm.rand.getrandbits(1))
+    def recombine(self, ind1: Individual, ind2: Individual, rand: Random) -> None:
+        start_with_ind1 = bool(rand.getrandbits(1))
 
         child1_genome, child2_genome = self.recombine_parent(ind1, ind2, start_with_ind1)
         ind1.genome = child1_genome
@@ -42,5 +45,26 @@ class RecombinationCX(Recombination):
 
         return child1_genome, child2_genome
 
+    def recombine_batch(self, genomes1: np.ndarray, genomes2: np.ndarray,
+                        rand: np.random.Generator) -> (np.ndarray, np.ndarray):
+        start_with_ind1 = rand.integers(0, 2, len(genomes1)).astype(bool)[:, None]
+        return self.recombine_parents_batch(np.where(start_with_ind1, genomes1, genomes2),
+                                            np.where(start_with_ind1, genomes2, genomes1))
+
+    @staticmethod
+    def recombine_parents_batch(main_genomes: np.ndarray, other_genomes: np.ndarray) -> (np.ndarray, np.ndarray):
+        count, num_genes = main_genomes.shape
+        # Walks the cycle through position 0 of every row, rows that closed their cycle stay inside it
+        rows = np.arange(count)
+        positions = np.empty_like(main_genomes)
+        positions[rows[:, None], main_genomes] = np.arange(num_genes)
+        cycle = np.zeros((count, num_genes), dtype=bool)
+        target_index = np.zeros(count, dtype=np.intp)
+        while not cycle[rows, target_index].all():
+            cycle[rows, target_index] = True
+            target_index = positions[rows, other_genomes[rows, target_index]]
+
+        return np.where(cycle, main_genomes, other_genomes), np.where(cycle, other_genomes, main_genomes)
+
     def __str__(self):
         return "CX (" + f'{self.probability}' + ")"
@@ -1,4 +1,7 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.recombination import Recombination
 from ga.individual import Individual
 
@@ -8,10 +11,14 @@ class RecombinationOX1(Recombination):
     def __init__(self, probability: float):
         super().__init__(probability)
 
-    def recombine(self, ind1: Individual, ind2: Individual) -> None:
-        cut1 = cut2 = GeneticAlgorithm.rand.randint(0, ind1.num_genes - 1)
+    def recombine(self, ind1: Individual, ind2: Individual, rand: Random) -> None:
+        # Two distinct cuts need two genes at least
+        if ind1.num_genes < 2:
+            return
+
+        cut1 = cut2 = rand.randint(0, ind1.num_genes - 1)
         while cut1 == cut2:
-            cut2 = GeneticAlgorithm.rand.randint(0, ind1.num_genes - 1)
+            cut2 = rand.randint(0, ind1.num_genes - 1)
 
         if cut1 > cut2:
             cut1, cut2 = cut2, cut1
@@ -45,5 +52,31 @@ class RecombinationOX1(Recombination):
 
         return child1_genome, child2_genome
 
+    def recombine_batch(self, genomes1: np.ndarray, genomes2: np.ndarray,
+                        rand: np.random.Generator) -> (np.ndarray, np.ndarray):
+        cut1, cut2 = self.random_cuts_batch(rand, len(genomes1), genomes1.shape[1], True)
+        return self.fill_batch(genomes1, genomes2, cut1, cut2), self.fill_batch(genomes2, genomes1, cut1, cut2)
+
+    @staticmethod
+    def fill_batch(segment_genomes: np.ndarray, order_genomes: np.ndarray, cut1: np.ndarray,
+                   cut2: np.ndarray) -> np.ndarray:
+        # Positions and genes of the other parent are both walked from cut2 + 1, wrapping around.
+        # Genes of the segment are dropped by a stable sort, the rest fill the positions outside the segment.
+        count, num_genes = segment_genomes.shape
+        rows = np.arange(count)[:, None]
+        columns = np.arange(num_genes)
+        segment = (columns >= cut1) & (columns <= cut2)
+        order = (cut2 + 1 + columns) % num_genes
+
+        in_segment = np.zeros_like(segment)
+        in_segment[rows, segment_genomes] = segment
+        candidates = order_genomes[rows, order]
+        kept = candidates[rows, np.argsort(in_segment[rows, candidates], axis=1, kind='stable')]
+
+        child = np.where(segment, segment_genomes, 0)
+        fill = columns < num_genes - (cut2 - cut1 + 1)
+        child[np.broadcast_to(rows, fill.shape)[fill], order[fill]] = kept[fill]
+        return child
+
     def __str__(self):
         return "OX1 (" + f'{self.probability}' + ")"
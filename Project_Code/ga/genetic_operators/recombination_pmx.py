@@ -1,4 +1,7 @@
-from ga.genetic_algorithm import GeneticAlgorithm
+from random import Random
+
+import numpy as np
+
 from ga.genetic_operators.recombination import Recombination
 from ga.individual import Individual
 
@@ -8,10 +11,10 @@ class RecombinationPMX(Recombination):
     def __init__(self, probability: float):
         super().__init__(probability)
 
-    def recombine(self, ind1: Individual, ind2: Individual) -> None:
+    def recombine(self, ind1: Individual, ind2: Individual, rand: Random) -> None:
         num_genes = ind1.num_genes
-        cut1 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
-        cut2 = GeneticAlgorithm.rand.randint(0, num_genes - 1)
+        cut1 = rand.randint(0, num_genes - 1)
+        cut2 = rand.randint(0, num_genes - 1)
         if cut2 < cut1:
             cut1, cut2 = cut2, cut1
         mapping1 = {}
@@ -47,5 +50,34 @@ class RecombinationPMX(Recombination):
         ind1.genome = child2
         ind2.genome = child1
 
+    def recombine_batch(self, genomes1: np.ndarray, genomes2: np.ndarray,
+                        rand: np.random.Generator) -> (np.ndarray, np.ndarray):
+        num_genes = genomes1.shape[1]
+        cut1, cut2 = self.random_cuts_batch(rand, len(genomes1), num_genes, False)
+        columns = np.arange(num_genes)
+        segment = (columns >= cut1) & (columns <= cut2)
+
+        child1 = self.fill_batch(genomes1, genomes2, segment)
+        child2 = self.fill_batch(genomes2, genomes1, segment)
+        return child2, child1
+
+    @staticmethod
+    def fill_batch(segment_genomes: np.ndarray, other_genomes: np.ndarray, segment: np.ndarray) -> np.ndarray:
+        # Segment from one parent, the other genes from the other parent. A gene already in the segment
+        # follows the mapping segment gene -> other gene at the same position, one step per round for all conflicts.
+        rows = np.arange(len(segment_genomes))[:, None]
+        positions = np.empty_like(segment_genomes)
+        positions[rows, segment_genomes] = np.arange(segment_genomes.shape[1])
+
+        child = np.where(segment, segment_genomes, other_genomes)
+        conflict_rows, conflict_columns = np.nonzero(~segment & segment[rows, positions[rows, child]])
+        genes = child[conflict_rows, conflict_columns]
+        while len(genes):
+            genes = other_genomes[conflict_rows, positions[conflict_rows, genes]]
+            mapped = segment[conflict_rows, positions[conflict_rows, genes]]
+            child[conflict_rows[~mapped], conflict_columns[~mapped]] = genes[~mapped]
+            conflict_rows, conflict_columns, genes = conflict_rows[mapped], conflict_columns[mapped], genes[mapped]
+        return child
+
     def __str__(self):
         return "PMX (" + f'{self.probability}' + ")"
@@ -1,13 +1,30 @@
 from abc import ABC, abstractmethod
+from array import array
+
+# Genes are stored as unsigned shorts, genomes assigned from lists are converted
+GENE_TYPECODE = 'H'
 
 
 class Individual(ABC):
+    __slots__ = ('num_genes', 'problem', '_genome', 'fitness', 'dirty', 'genome_shared')
 
     def __init__(self, problem: "Problem", num_genes: int):
         self.num_genes = num_genes
         self.problem = problem
-        self.genome = [-1] * num_genes
+        self.genome = array(GENE_TYPECODE, [0]) * num_genes
         self.fitness = 0
+        # The genome changed since the fitness was computed
+        self.dirty = True
+        # Copies share the genome until one of them changes it in place, see own_genome
+        self.genome_shared = False
+
+    @property
+    def genome(self) -> array:
+        return self._genome
+
+    @genome.setter
+    def genome(self, genome) -> None:
+        self._genome = genome if isinstance(genome, array) else array(GENE_TYPECODE, genome)
 
     @abstractmethod
     def swap_genes(self, other, index: int):
@@ -17,6 +34,24 @@ class Individual(ABC):
     def compute_fitness(self) -> float:
         pass
 
+    def own_genome(self) -> None:
+        # Called before changing genes in place, assigning a new genome needs no call
+        if self.genome_shared:
+            self._genome = self._genome[:]
+            self.genome_shared = False
+
+    def set_fitness(self, fitness: float) -> None:
+        # Fitness computed outside this individual, by a batch or a worker process
+        self.fitness = fitness
+
+    # Incremental mutations report their changes, individuals that cannot update their fitness are marked dirty
+
+    def genes_swapped(self, index1: int, index2: int) -> None:
+        self.dirty = True
+
+    def segment_reversed(self, start: int, end: int) -> None:
+        self.dirty = True
+
     @abstractmethod
     def better_than(self, other: "Individual") -> bool:
         pass
@@ -5,11 +5,14 @@ from ga.problem import Problem
 
 
 class IntVectorIndividual(Individual):
+    __slots__ = ()
 
     def __init__(self, problem: Problem, num_genes: int):
         super().__init__(problem, num_genes)
 
     def swap_genes(self, other, index: int):
+        self.own_genome()
+        other.own_genome()
         aux = self.genome[index]
         self.genome[index] = other.genome[index]
         other.genome[index] = aux
@@ -0,0 +1,187 @@
+from copy import copy
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+
+from ga.ga_event import GAEvent
+from ga.genetic_algorithm import GeneticAlgorithm, spawn_seeds
+from ga.individual import Individual
+from ga.problem import Problem
+from ga.selection_methods.selection_method import SelectionMethod
+
+# Island model: every island is a GeneticAlgorithm with its own seed and operators, evolved in its own process.
+# Every migration_interval generations the best individuals of each island replace the worst of another one.
+# The coordinator fires one GAEvent per generation with the best of all islands, like a single GeneticAlgorithm.
+# Only genomes, fitness values, averages and counters cross the process boundary.
+# Termination criteria are checked by the coordinator after every replayed generation. Islands only hear from it
+# between migrations, so they may have evolved up to migration_interval generations past the one that met a
+# criterion: the run reports up to that generation, but a TimeLimit is overshot by the time of those generations
+# and an EvaluationBudget by their evaluations.
+
+RING = 'ring'
+RANDOM = 'random'
+
+
+def run_island(connection: Connection, problem: Problem, settings: tuple, options: tuple) -> None:
+    seed, population_size, max_generations, selection_method, recombination, mutation = settings
+    ga = GeneticAlgorithm(seed, population_size, max_generations, selection_method, recombination, mutation)
+    ga.problem = problem
+    ga.batch_evaluation, ga.batch_operators, ga.fitness_cache_size, ga.local_search, migrants = options
+
+    ga.start_run()
+    try:
+        ga.initialize_population()
+        connection.send(([get_generation_report(ga)], get_emigrants(ga, migrants)))
+
+        message = connection.recv()
+        while message is not None:
+            generations, immigrants = message
+            receive_immigrants(ga, immigrants)
+            reports = []
+            for _ in range(generations):
+                ga.next_generation()
+                reports.append(get_generation_report(ga))
+            connection.send((reports, get_emigrants(ga, migrants)))
+            message = connection.recv()
+    finally:
+        ga.end_run()
+        connection.close()
+
+
+def get_generation_report(ga: GeneticAlgorithm) -> tuple:
+    event = ga.create_event()
+    counters = (event.cache_hits, event.cache_misses, event.skipped_evaluations, event.local_search_improved,
+                event.local_search_gain)
+    return ga.best_in_run.genome, ga.best_in_run.fitness, ga.population.average_fitness, ga.evaluations, counters
+
+
+def get_emigrants(ga: GeneticAlgorithm, migrants: int) -> list:
+    individuals = ga.population.individuals
+    return [(individuals[i].genome, individuals[i].fitness) for i in ga.population.get_ranking()[:migrants]]
+
+
+def receive_immigrants(ga: GeneticAlgorithm, immigrants: list) -> None:
+    individuals = [build_evaluated_individual(ga.problem, genome, fitness) for genome, fitness in immigrants]
+    ga.population.replace_worst(individuals)
+    for ind in individuals:
+        if ind.better_than(ga.best_in_run):
+            ga.best_in_run = ind
+
+
+def build_evaluated_individual(problem: Problem, genome, fitness: float) -> Individual:
+    ind = problem.build_individual(genome)
+    ind.set_fitness(fitness)
+    ind.dirty = False
+    return ind
+
+
+class IslandModel(GeneticAlgorithm):
+
+    def __init__(self,
+                 seed: int,
+                 population_size: int,
+                 max_generations: int,
+                 selection_method: SelectionMethod,
+                 recombination: "Recombination",
+                 mutation: "Mutation",
+                 num_islands: int = 4):
+        super().__init__(seed, population_size, max_generations, selection_method, recombination, mutation)
+        self.migration_interval = 10
+        self.migrants = 1
+        self.topology = RING
+        self.average_fitness = 0
+        # GAEvent counters summed over the islands: cache hits and misses, skipped evaluations and local search
+        self.counters = (0, 0, 0, 0, 0)
+        # (seed, population size, selection, recombination, mutation) of every island, all alike until configured
+        self.islands = [(island_seed, population_size, selection_method, recombination, mutation)
+                        for island_seed in spawn_seeds(seed, num_islands)]
+
+    def configure_island(self, index: int, population_size: int, selection_method: SelectionMethod,
+                         recombination: "Recombination", mutation: "Mutation") -> None:
+        # Own settings for island index, it keeps its seed
+        self.islands[index] = (self.islands[index][0], population_size, selection_method, recombination, mutation)
+
+    def run(self) -> None:
+        if self.problem is None:
+            return None
+
+        options = (self.batch_evaluation, self.batch_operators, self.fitness_cache_size, self.local_search,
+                   self.migrants)
+        connections = []
+        processes = []
+        try:
+            for seed, population_size, selection_method, recombination, mutation in self.islands:
+                connection, island_connection = Pipe()
+                settings = (seed, population_size, self.max_generations, selection_method, recombination, mutation)
+                process = Process(target=run_island, args=(island_connection, self.problem, settings, options),
+                                  daemon=True)
+                process.start()
+                island_connection.close()
+                connections.append(connection)
+                processes.append(process)
+
+            self.evolve_islands(connections)
+            for connection in connections:
+                connection.send(None)
+            for process in processes:
+                process.join()
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+    def evolve_islands(self, connections: [Connection]) -> None:
+        self.generation = 0
+        self.best_in_run = None
+        self.start_termination_criteria()
+        results = [connection.recv() for connection in connections]
+        self.report_generation([reports[0] for reports, _ in results])
+
+        while not self.is_terminated():
+            generations = min(self.migration_interval, self.max_generations - self.generation)
+            immigrants = self.route_migrants([emigrants for _, emigrants in results])
+            for connection, island_immigrants in zip(connections, immigrants):
+                connection.send((generations, island_immigrants))
+
+            # Islands evolve in parallel, their reports are then replayed generation by generation
+            results = [connection.recv() for connection in connections]
+            for reports in zip(*[island_reports for island_reports, _ in results]):
+                self.generation += 1
+                self.report_generation(reports)
+                if self.is_terminated():
+                    break
+        self.fire_run_ended()
+
+    def route_migrants(self, emigrants: list) -> list:
+        # Immigrants of every island, ring sends to the next island and random to any other one
+        num_islands = len(emigrants)
+        immigrants = [[] for _ in range(num_islands)]
+        if num_islands < 2:
+            return immigrants
+
+        for i, island_emigrants in enumerate(emigrants):
+            if self.topology == RANDOM:
+                target = self.rand.randint(0, num_islands - 2)
+                target += target >= i
+            else:
+                target = (i + 1) % num_islands
+            immigrants[target].extend(island_emigrants)
+        return immigrants
+
+    def report_generation(self, reports: tuple) -> None:
+        # (best genome, best fitness, average fitness, evaluations, counters) of every island for the current generation
+        for genome, fitness, _, _, _ in reports:
+            if self.best_in_run is None or fitness != self.best_in_run.fitness:
+                candidate = build_evaluated_individual(self.problem, genome, fitness)
+                if self.best_in_run is None or candidate.better_than(self.best_in_run):
+                    self.best_in_run = candidate
+
+        population_sizes = [island[1] for island in self.islands]
+        total = sum(average * size for (_, _, average, _, _), size in zip(reports, population_sizes))
+        self.average_fitness = total / sum(population_sizes)
+        self.evaluations = sum(evaluations for _, _, _, evaluations, _ in reports)
+        self.counters = tuple(sum(values) for values in zip(*(counters for _, _, _, _, counters in reports)))
+        self.fire_generation_ended()
+
+    def create_event(self, run_ended: bool = False) -> GAEvent:
+        return GAEvent(copy(self.best_in_run), self.average_fitness, run_ended, *self.counters,
+                       termination_reason=self.termination_reason if run_ended else None)
@@ -0,0 +1,61 @@
+import time
+from abc import ABC, abstractmethod
+from random import Random
+
+from ga.individual import Individual
+from ga.population import Population
+
+# Memetic stage: some individuals of every interval-th generation are improved by a problem specific local search.
+# BEST picks the amount best individuals, SAMPLE picks every individual with probability amount.
+# All improvements of a generation share time_budget seconds. The default None means no limit and repeatable runs,
+# a budget makes the results depend on the speed of the machine.
+
+BEST = 'best'
+SAMPLE = 'sample'
+
+
+class LocalSearch(ABC):
+
+    def __init__(self, trigger: str = BEST, amount: float = 1, time_budget: float | None = None, interval: int = 1):
+        self.trigger = trigger
+        self.amount = amount
+        self.time_budget = time_budget
+        self.interval = interval
+        # Statistics of the last run, evaluations are the fitness computations improve made
+        self.improved = 0
+        self.gain = 0
+        self.evaluations = 0
+
+    def run(self, population: Population, generation: int, rand: Random) -> None:
+        self.improved = 0
+        self.gain = 0
+        self.evaluations = 0
+        if generation % self.interval != 0:
+            return
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        for index in self.select_indexes(population, rand):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+            ind = population.individuals[index]
+            ind.own_genome()
+            gain = self.improve(ind, deadline)
+            if gain > 0:
+                self.improved += 1
+                self.gain += gain
+
+    def select_indexes(self, population: Population, rand: Random) -> [int]:
+        if self.trigger == SAMPLE:
+            return [i for i in range(population.size) if rand.random() < self.amount]
+        return population.get_ranking()[:int(self.amount)]
+
+    @abstractmethod
+    def improve(self, individual: Individual, deadline: float | None) -> float:
+        # Changes the genome in place and returns how much the fitness improved.
+        # The individual must be left clean with its new fitness, or dirty to be evaluated again.
+        pass
+
+    def __str__(self):
+        budget = 'no limit' if self.time_budget is None else f'{self.time_budget}s'
+        return f'{self.trigger} ({self.amount}, {budget}, every {self.interval})'
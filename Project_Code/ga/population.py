@@ -1,25 +1,90 @@
-from ga.individual import Individual
+from array import array
+from functools import cmp_to_key
+from random import Random
+
+import numpy as np
+
+from ga.individual import Individual, GENE_TYPECODE
 from ga.problem import Problem
 
 
 class Population:
 
-    def __init__(self, size: int, problem: Problem = None):
+    def __init__(self, size: int, problem: Problem = None, rand: Random = None):
         self.size = size
         self.individuals = []
         self.best_individual = None
         self.problem = problem
+        self.skipped_evaluations = 0
+        # Fitness computations and fitness cache hits of the last evaluation
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         if problem is not None:
             for i in range(size):
-                self.individuals.append(problem.generate_individual())
+                self.individuals.append(problem.generate_individual(rand))
+
+    def evaluate(self, batch: bool = False, pool: "PopulationPool" = None, cache: "FitnessCache" = None) -> Individual:
+        # Individuals the operators left untouched keep the fitness they were copied with
+        individuals = [ind for ind in self.individuals if ind.dirty]
+        self.skipped_evaluations = len(self.individuals) - len(individuals)
+
+        if cache is not None:
+            self.cache_hits, self.cache_misses = cache.evaluate(
+                individuals, lambda misses: self.compute_fitness(misses, batch, pool))
+            self.evaluations = self.cache_misses
+        else:
+            self.compute_fitness(individuals, batch, pool)
+            self.cache_hits = self.cache_misses = 0
+            self.evaluations = len(individuals)
+
+        for ind in individuals:
+            ind.dirty = False
 
-    def evaluate(self) -> Individual:
         for ind in self.individuals:
-            ind.compute_fitness()
             if self.best_individual is None or ind.better_than(self.best_individual):
                 self.best_individual = ind
         return self.best_individual
 
+    @staticmethod
+    def compute_fitness(individuals: list, batch: bool = False, pool: "PopulationPool" = None) -> None:
+        if pool is not None:
+            pool.evaluate(individuals)
+        elif batch and individuals:
+            individuals[0].problem.evaluate_individuals(individuals)
+        else:
+            for ind in individuals:
+                ind.compute_fitness()
+
+    def get_ranking(self) -> [int]:
+        # Indexes of the individuals from best to worst
+        def compare(i: int, j: int) -> int:
+            if self.individuals[i].better_than(self.individuals[j]):
+                return -1
+            return 1 if self.individuals[j].better_than(self.individuals[i]) else 0
+
+        return sorted(range(len(self.individuals)), key=cmp_to_key(compare))
+
+    def replace_worst(self, individuals: list) -> None:
+        # Immigrants take the places of the worst individuals
+        for index, ind in zip(self.get_ranking()[::-1], individuals):
+            self.individuals[index] = ind
+            if self.best_individual is None or ind.better_than(self.best_individual):
+                self.best_individual = ind
+
+    def get_genomes(self, indexes: np.ndarray) -> np.ndarray:
+        # One row per individual, for the batch operators
+        genomes = b''.join(self.individuals[i].genome.tobytes() for i in indexes)
+        return np.frombuffer(genomes, dtype=np.uint16).reshape(len(indexes), -1).astype(np.intp)
+
+    def set_genomes(self, indexes: np.ndarray, genomes: np.ndarray) -> None:
+        genomes = genomes.astype(np.uint16).tobytes()
+        row_size = len(genomes) // len(indexes)
+        for k, i in enumerate(indexes):
+            ind = self.individuals[i]
+            ind.genome = array(GENE_TYPECODE, genomes[k * row_size:(k + 1) * row_size])
+            ind.genome_shared = False
+
     @staticmethod
     def compute_ind(ind: Individual) -> Individual:
         ind.compute_fitness()
@@ -0,0 +1,39 @@
+import os
+from multiprocessing import Pool
+
+from ga.problem import Problem
+
+# Fitness evaluation spread over worker processes.
+# The problem is sent once when a worker starts, tasks only carry genomes and only fitness values come back.
+# Chunks are mapped in order, so the results do not depend on the number of workers.
+
+_worker_problem = None
+
+
+def init_worker(problem: Problem) -> None:
+    global _worker_problem
+    _worker_problem = problem
+
+
+def evaluate_genomes(genomes: list) -> list:
+    return _worker_problem.evaluate_genomes(genomes)
+
+
+class PopulationPool:
+
+    def __init__(self, problem: Problem, workers: int | None):
+        self.workers = workers or os.cpu_count()
+        self.pool = Pool(self.workers, initializer=init_worker, initargs=(problem,))
+
+    def evaluate(self, individuals: list) -> None:
+        chunk_size = max(1, -(-len(individuals) // (self.workers * 4)))
+        chunks = [[list(ind.genome) for ind in individuals[i:i + chunk_size]]
+                  for i in range(0, len(individuals), chunk_size)]
+
+        fitness_values = [fitness for chunk in self.pool.map(evaluate_genomes, chunks) for fitness in chunk]
+        for ind, fitness in zip(individuals, fitness_values):
+            ind.set_fitness(fitness)
+
+    def close(self) -> None:
+        self.pool.close()
+        self.pool.join()
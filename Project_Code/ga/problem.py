@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from random import Random
 
 from ga.individual import Individual
 
@@ -6,5 +7,25 @@ from ga.individual import Individual
 class Problem(ABC):
 
     @abstractmethod
-    def generate_individual(self) -> Individual:
+    def generate_individual(self, rand: Random) -> Individual:
         pass
+
+    def evaluate_individuals(self, individuals: list) -> None:
+        # Problems that can score many individuals at once override this
+        for ind in individuals:
+            ind.compute_fitness()
+
+    @abstractmethod
+    def build_individual(self, genome) -> Individual:
+        # Individual with the given genome, used to bring genomes back from other processes
+        pass
+
+    def get_fitness_cache(self, max_size: int) -> "FitnessCache | None":
+        # Problems whose fitness only depends on the genome can keep a FitnessCache, None disables caching
+        return None
+
+    def evaluate_genomes(self, genomes: list) -> list:
+        # Fitness of each genome, called by the PopulationPool workers
+        individuals = [self.build_individual(genome) for genome in genomes]
+        self.evaluate_individuals(individuals)
+        return [ind.fitness for ind in individuals]
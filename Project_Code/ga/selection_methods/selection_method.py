@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from random import Random
 
 from ga.population import Population
 
@@ -6,5 +7,5 @@ from ga.population import Population
 class SelectionMethod(ABC):
 
     @abstractmethod
-    def run(self, population: Population) -> Population:
+    def run(self, population: Population, rand: Random) -> Population:
         pass
@@ -1,7 +1,6 @@
 from copy import copy
+from random import Random
 
-from ga.genetic_algorithm import GeneticAlgorithm
-from ga.individual import Individual
 from ga.population import Population
 from ga.selection_methods.selection_method import SelectionMethod
 
@@ -11,19 +10,21 @@ class Tournament(SelectionMethod):
     def __init__(self, tournament_size: int):
         self.tournament_size = tournament_size
 
-    def run(self, population: Population) -> Population:
+    def run(self, population: Population, rand: Random) -> Population:
         new_population = Population(population.size)
-        for i in range(population.size):
-            new_population.individuals.append(self.tournament(population))
+        new_population.individuals = [copy(population.individuals[i]) for i in self.select_indexes(population, rand)]
         return new_population
 
-    def tournament(self, population: Population) -> Individual:
-        best = population.individuals[GeneticAlgorithm.rand.randint(0, population.size - 1)]
+    def select_indexes(self, population: Population, rand: Random) -> [int]:
+        return [self.tournament(population, rand) for _ in range(population.size)]
+
+    def tournament(self, population: Population, rand: Random) -> int:
+        best = rand.randint(0, population.size - 1)
         for i in range(1, self.tournament_size):
-            ind = population.individuals[GeneticAlgorithm.rand.randint(0, population.size - 1)]
-            if ind.better_than(best):
-                best = ind
-        return copy(best)
+            index = rand.randint(0, population.size - 1)
+            if population.individuals[index].better_than(population.individuals[best]):
+                best = index
+        return best
 
     def __str__(self):
         return "Tournament (" + f'{self.tournament_size}' + ")"
@@ -0,0 +1,13 @@
+from ga.termination_criteria.termination_criterion import TerminationCriterion
+
+
+class EvaluationBudget(TerminationCriterion):
+
+    def __init__(self, max_evaluations: int):
+        self.max_evaluations = max_evaluations
+
+    def reached(self, ga: "GeneticAlgorithm") -> bool:
+        return ga.evaluations >= self.max_evaluations
+
+    def __str__(self):
+        return "Evaluation budget (" + f'{self.max_evaluations}' + ")"
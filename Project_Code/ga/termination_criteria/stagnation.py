@@ -0,0 +1,23 @@
+from ga.termination_criteria.termination_criterion import TerminationCriterion
+
+
+class Stagnation(TerminationCriterion):
+
+    def __init__(self, generations: int):
+        self.generations = generations
+        self.best_fitness = None
+        self.last_improvement = 0
+
+    def start(self, ga: "GeneticAlgorithm") -> None:
+        self.best_fitness = None
+        self.last_improvement = 0
+
+    def reached(self, ga: "GeneticAlgorithm") -> bool:
+        # best_in_run is only replaced by a better individual
+        if ga.best_in_run.fitness != self.best_fitness:
+            self.best_fitness = ga.best_in_run.fitness
+            self.last_improvement = ga.generation
+        return ga.generation - self.last_improvement >= self.generations
+
+    def __str__(self):
+        return "Stagnation (" + f'{self.generations}' + " generations)"
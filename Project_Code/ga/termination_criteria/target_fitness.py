@@ -0,0 +1,18 @@
+from copy import copy
+
+from ga.termination_criteria.termination_criterion import TerminationCriterion
+
+
+class TargetFitness(TerminationCriterion):
+
+    def __init__(self, fitness: float):
+        self.fitness = fitness
+
+    def reached(self, ga: "GeneticAlgorithm") -> bool:
+        # The problem decides what better means, the target is compared as an individual with that fitness
+        target = copy(ga.best_in_run)
+        target.fitness = self.fitness
+        return not target.better_than(ga.best_in_run)
+
+    def __str__(self):
+        return "Target fitness (" + f'{self.fitness}' + ")"
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class TerminationCriterion(ABC):
+
+    def start(self, ga: "GeneticAlgorithm") -> None:
+        # Called when a run starts, criteria are reused by the runs of an experiment
+        pass
+
+    @abstractmethod
+    def reached(self, ga: "GeneticAlgorithm") -> bool:
+        pass
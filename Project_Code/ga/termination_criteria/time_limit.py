@@ -0,0 +1,19 @@
+import time
+
+from ga.termination_criteria.termination_criterion import TerminationCriterion
+
+
+class TimeLimit(TerminationCriterion):
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.deadline = None
+
+    def start(self, ga: "GeneticAlgorithm") -> None:
+        self.deadline = time.perf_counter() + self.seconds
+
+    def reached(self, ga: "GeneticAlgorithm") -> bool:
+        return time.perf_counter() >= self.deadline
+
+    def __str__(self):
+        return "Time limit (" + f'{self.seconds}' + "s)"
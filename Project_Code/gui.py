@@ -19,6 +19,11 @@ from ga.genetic_operators.recombination_cx import RecombinationCX
 from ga.genetic_operators.recombination_ox1 import RecombinationOX1
 from ga.genetic_operators.recombination_pmx import RecombinationPMX
 from ga.selection_methods.tournament import Tournament
+from ga.termination_criteria.evaluation_budget import EvaluationBudget
+from ga.termination_criteria.stagnation import Stagnation
+from ga.termination_criteria.target_fitness import TargetFitness
+from ga.termination_criteria.time_limit import TimeLimit
+from warehouse.conflict_based_search import ConflictBasedSearch
 from warehouse.warehouse_agent_search import WarehouseAgentSearch, read_state_from_txt_file
 from warehouse.warehouse_experiments_factory import WarehouseExperimentsFactory
 from warehouse.warehouse_problemforGA import WarehouseProblemGA
@@ -154,6 +159,69 @@ class Window(tk.Tk):
                                                         variable=self.allow_collisions_run)
         self.allow_collisions_checkbox.grid(row=9, column=1)
 
+        self.space_time_run = tk.BooleanVar(value=False)
+        self.space_time_checkbox = tk.Checkbutton(master=self.panel_parameters, text='Space-time replanning',
+                                                  variable=self.space_time_run)
+        self.space_time_checkbox.grid(row=9, column=0)
+
+        # Optional termination criteria, empty entries are not used
+
+        self.label_stagnation = tk.Label(master=self.panel_parameters, text="Stagnation generations: ", anchor="e",
+                                         width=25)
+        self.label_stagnation.grid(row=10, column=0)
+
+        self.entry_stagnation = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_stagnation.grid(row=10, column=1)
+
+        self.label_time_limit = tk.Label(master=self.panel_parameters, text="Time limit (s): ", anchor="e", width=25)
+        self.label_time_limit.grid(row=11, column=0)
+
+        self.entry_time_limit = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_time_limit.grid(row=11, column=1)
+
+        self.label_max_evaluations = tk.Label(master=self.panel_parameters, text="Max evaluations: ", anchor="e",
+                                              width=25)
+        self.label_max_evaluations.grid(row=12, column=0)
+
+        self.entry_max_evaluations = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_max_evaluations.grid(row=12, column=1)
+
+        self.label_target_fitness = tk.Label(master=self.panel_parameters, text="Target fitness: ", anchor="e",
+                                             width=25)
+        self.label_target_fitness.grid(row=13, column=0)
+
+        self.entry_target_fitness = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_target_fitness.grid(row=13, column=1)
+
+        # Plan shown by the simulation, the actions of the best individual or a conflict free plan of its routes
+
+        self.label_plan_methods = tk.Label(master=self.panel_parameters, text="Simulation plan: ", anchor="e",
+                                           width=25)
+        self.label_plan_methods.grid(row=14, column=0)
+
+        plan_methods = ['Best individual', 'CBS', 'ECBS']
+
+        self.combo_plan_methods = ttk.Combobox(master=self.panel_parameters, state="readonly",
+                                               values=plan_methods, width=14)
+        self.combo_plan_methods.set(plan_methods[0])
+        self.combo_plan_methods.grid(row=14, column=1)
+
+        self.label_suboptimality = tk.Label(master=self.panel_parameters, text="ECBS suboptimality: ", anchor="e",
+                                            width=25)
+        self.label_suboptimality.grid(row=15, column=0)
+
+        self.entry_suboptimality = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_suboptimality.insert(tk.END, '1.5')
+        self.entry_suboptimality.grid(row=15, column=1)
+
+        self.label_plan_time_limit = tk.Label(master=self.panel_parameters, text="Plan time limit (s): ", anchor="e",
+                                              width=25)
+        self.label_plan_time_limit.grid(row=16, column=0)
+
+        self.entry_plan_time_limit = tk.Entry(master=self.panel_parameters, width=17)
+        self.entry_plan_time_limit.insert(tk.END, '5')
+        self.entry_plan_time_limit.grid(row=16, column=1)
+
         # 1.1.2 Run Panel
 
         self.button_dataset = tk.Button(master=self.panel_run, text='Problem',
@@ -211,7 +279,7 @@ class Window(tk.Tk):
         self.label_status = tk.Label(master=self.panel_bottom, text="status: ")
         self.label_status.pack(side="left", padx=5)
 
-        self.entry_status = tk.Entry(master=self.panel_bottom, width=10)
+        self.entry_status = tk.Entry(master=self.panel_bottom, width=25)
         self.entry_status.pack(side="left", padx=3)
 
         # 3 - RIGHT PANEL - Simulation Panel --------------------------------------------------
@@ -273,6 +341,7 @@ class Window(tk.Tk):
         filename = fd.askopenfilename(initialdir='.')
         if filename:
             matrix, num_rows, num_columns = read_state_from_txt_file(filename)
+            self.problem_filename = filename
             self.initial_state = WarehouseState(matrix, num_rows, num_columns)
             self.agent_search = WarehouseAgentSearch(copy(self.initial_state))
             self.solution = None
@@ -303,7 +372,7 @@ class Window(tk.Tk):
                             open_experiments=tk.DISABLED, run_experiments=tk.DISABLED, stop_experiments=tk.DISABLED,
                             simulation=tk.DISABLED, stop_simulation=tk.DISABLED)
 
-        self.solver = SearchSolver(self, self.agent_search)
+        self.solver = SearchSolver(self, self.agent_search, self.problem_filename)
         self.solver.daemon = True
         self.solver.start()
 
@@ -336,6 +405,7 @@ class Window(tk.Tk):
             recombination_method,
             mutation_method
         )
+        self.genetic_algorithm.termination_criteria = self.build_termination_criteria()
 
         self.queue.queue.clear()
         self.generations = 0
@@ -344,6 +414,7 @@ class Window(tk.Tk):
         self.best_values = []
 
         self.problem_ga.agent_search.initial_environment.allow_collisions = self.allow_collisions_run.get()
+        self.problem_ga.agent_search.space_time_replanning = self.space_time_run.get()
         self.genetic_algorithm.problem = self.problem_ga
         self.genetic_algorithm.add_tkinter_listener(self)
         self.genetic_algorithm.daemon = True
@@ -361,7 +432,7 @@ class Window(tk.Tk):
                             simulation=tk.DISABLED, stop_simulation=tk.NORMAL)
         self.queue.queue.clear()
         best_in_run = self.genetic_algorithm.best_in_run
-        self.solution_runner = SolutionRunner(self, best_in_run, copy(self.initial_state))
+        self.solution_runner = SolutionRunner(self, best_in_run, copy(self.initial_state), self.build_planner())
         self.solution_runner.daemon = True
         self.solution_runner.start()
         self.active_threads.append(self.solution_runner)
@@ -499,6 +570,8 @@ class Window(tk.Tk):
         if not self.queue.empty():
             ga_info = self.queue.get()
             if ga_info.run_ended:
+                self.entry_status.delete(0, tk.END)
+                self.entry_status.insert(tk.END, ga_info.termination_reason)
                 self.queue.queue.clear()
                 self.after_cancel(self.after_id)
                 self.after_id = None
@@ -533,6 +606,25 @@ class Window(tk.Tk):
         self.ax.autoscale_view()
         self.canvas_plot.draw()
 
+    def build_termination_criteria(self) -> list:
+        termination_criteria = []
+        if self.entry_stagnation.get().strip():
+            termination_criteria.append(Stagnation(int(self.entry_stagnation.get())))
+        if self.entry_time_limit.get().strip():
+            termination_criteria.append(TimeLimit(float(self.entry_time_limit.get())))
+        if self.entry_max_evaluations.get().strip():
+            termination_criteria.append(EvaluationBudget(int(self.entry_max_evaluations.get())))
+        if self.entry_target_fitness.get().strip():
+            termination_criteria.append(TargetFitness(float(self.entry_target_fitness.get())))
+        return termination_criteria
+
+    def build_planner(self) -> ConflictBasedSearch | None:
+        plan_methods_index = self.combo_plan_methods.current()
+        if plan_methods_index == 0:
+            return None
+        suboptimality = float(self.entry_suboptimality.get()) if plan_methods_index == 2 else 1
+        return ConflictBasedSearch(self.problem_ga.agent_search, suboptimality, float(self.entry_plan_time_limit.get()))
+
     def validate_parameters(self) -> bool:
         try:
             seed = int(self.entry_seed.get())
@@ -591,6 +683,53 @@ class Window(tk.Tk):
             messagebox.showwarning("Warning", "Mutation probability should be a float in [0, 1]")
             return False
 
+        try:
+            if self.entry_stagnation.get().strip() and int(self.entry_stagnation.get()) <= 0:
+                messagebox.showwarning("Warning", "Stagnation generations should be a positive integer")
+                return False
+        except ValueError:
+            messagebox.showwarning("Warning", "Stagnation generations should be a positive integer")
+            return False
+
+        try:
+            if self.entry_time_limit.get().strip() and float(self.entry_time_limit.get()) <= 0:
+                messagebox.showwarning("Warning", "Time limit should be a positive number of seconds")
+                return False
+        except ValueError:
+            messagebox.showwarning("Warning", "Time limit should be a positive number of seconds")
+            return False
+
+        try:
+            if self.entry_max_evaluations.get().strip() and int(self.entry_max_evaluations.get()) <= 0:
+                messagebox.showwarning("Warning", "Max evaluations should be a positive integer")
+                return False
+        except ValueError:
+            messagebox.showwarning("Warning", "Max evaluations should be a positive integer")
+            return False
+
+        try:
+            if self.entry_target_fitness.get().strip():
+                float(self.entry_target_fitness.get())
+        except ValueError:
+            messagebox.showwarning("Warning", "Target fitness should be a number")
+            return False
+
+        try:
+            if float(self.entry_suboptimality.get()) < 1:
+                messagebox.showwarning("Warning", "ECBS suboptimality should be a number not smaller than 1")
+                return False
+        except ValueError:
+            messagebox.showwarning("Warning", "ECBS suboptimality should be a number not smaller than 1")
+            return False
+
+        try:
+            if float(self.entry_plan_time_limit.get()) <= 0:
+                messagebox.showwarning("Warning", "Plan time limit should be a positive number of seconds")
+                return False
+        except ValueError:
+            messagebox.showwarning("Warning", "Plan time limit should be a positive number of seconds")
+            return False
+
         return True
 
 
@@ -626,16 +765,17 @@ class ExperimentsRunner(threading.Thread):
 
 class SearchSolver(threading.Thread):
 
-    def __init__(self, gui: Window, agent: WarehouseAgentSearch):
+    def __init__(self, gui: Window, agent: WarehouseAgentSearch, problem_filename: str):
         super(SearchSolver, self).__init__()
         self.gui = gui
         self.agent = agent
+        self.problem_filename = problem_filename
 
     def stop(self):
         self.agent.stop()
 
     def run(self):
-        self.agent.calculate_pairs_distances()
+        self.agent.calculate_pairs_distances_cached(self.problem_filename)
 
         self.agent.search_method.stopped = True
         self.gui.problem_ga = WarehouseProblemGA(self.agent)
@@ -650,11 +790,12 @@ class SearchSolver(threading.Thread):
 
 class SolutionRunner(threading.Thread):
 
-    def __init__(self, gui: Window, best_in_run, state: WarehouseState):
+    def __init__(self, gui: Window, best_in_run, state: WarehouseState, planner: ConflictBasedSearch = None):
         super(SolutionRunner, self).__init__()
         self.gui = gui
         self.best_in_run = best_in_run
         self.state = state
+        self.planner = planner
         self.thread_running = False
 
     def stop(self):
@@ -662,7 +803,7 @@ class SolutionRunner(threading.Thread):
 
     def run(self):
         self.thread_running = True
-        forklift_path, steps = self.best_in_run.obtain_all_path()
+        forklift_path, steps = self.obtain_all_path()
         old_cell = [None] * len(forklift_path)
         new_cells = []
         for step in range(steps):
@@ -696,3 +837,20 @@ class SolutionRunner(threading.Thread):
 
             self.gui.queue.put((copy(self.state), step - 1, False))
         self.gui.queue.put((None, steps, True))  # Done
+
+    def obtain_all_path(self):
+        if self.planner is None:
+            return self.best_in_run.obtain_all_path()
+
+        forklifts_actions = self.planner.solve(self.best_in_run)
+        self.gui.entry_status.delete(0, tk.END)
+        if forklifts_actions is None:
+            # The actions of the best individual are shown instead
+            reason = 'time limit' if self.planner.timed_out else 'no plan'
+            self.gui.entry_status.insert(tk.END, f'{self.planner}: {reason}')
+            return self.best_in_run.obtain_all_path()
+
+        self.gui.entry_status.insert(tk.END, f'{self.planner}: cost {self.planner.cost}')
+        plan = copy(self.best_in_run)
+        plan.forklifts_actions = forklifts_actions
+        return plan.obtain_all_path()
@@ -54,6 +54,10 @@ class GraphSearch(SearchMethod, Generic[T]):
     def add_successor_to_frontier(self, successor: State, parent: Node) -> None:
         pass
 
+    def get_explored_states(self) -> set:
+        # States expanded by the last search
+        return self._explored
+
     def compute_statistics(self, successors_size: int) -> None:
         self.num_expanded_nodes += 1
         self.num_generated_states += successors_size
@@ -1,17 +1,19 @@
 from abc import abstractmethod
+from typing import Type
 
 from agentsearch.problem import Problem
 from agentsearch.state import State
 from search_methods.graph_search import GraphSearch
 from search_methods.node import Node
 from search_methods.solution import Solution
+from utils.node_collection import NodeCollection
 from utils.node_priority_queue import NodePriorityQueue
 
 
 class InformedSearch(GraphSearch[NodePriorityQueue]):
 
-    def __init__(self):
-        super().__init__(NodePriorityQueue)
+    def __init__(self, collection_type: Type[NodeCollection] = NodePriorityQueue):
+        super().__init__(collection_type)
         self.heuristic = None
 
     def search(self, problem: Problem) -> Solution:
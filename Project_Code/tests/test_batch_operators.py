@@ -0,0 +1,145 @@
+from collections import Counter
+from random import Random
+
+import numpy as np
+import pytest
+
+from ga.genetic_operators.mutation_insert import MutationInsert
+from ga.genetic_operators.mutation_psm import MutationPSM
+from ga.genetic_operators.mutation_rsm import MutationRSM
+from ga.genetic_operators.recombination_cx import RecombinationCX
+from ga.genetic_operators.recombination_ox1 import RecombinationOX1
+from ga.genetic_operators.recombination_pmx import RecombinationPMX
+from ga.individual_int_vector import IntVectorIndividual
+from ga.population import Population
+from ga.problem import Problem
+
+# Batch operators against the per individual ones on random permutations.
+# Children must be permutations for any genome length, and both versions must give every child with the same
+# probability, compared by the total variation distance of the children counts of many copies of the same parents.
+
+OPERATORS = [RecombinationPMX(1), RecombinationOX1(1), RecombinationCX(1),
+             MutationInsert(1), MutationRSM(1), MutationPSM(0.2)]
+NUM_GENES = [1, 2, 3, 5, 8, 30]
+SEEDS = range(20)
+POPULATION_SIZE = 40
+# Copies of the parents for the distributions and largest distance allowed between them
+SAMPLES = 20000
+TOLERANCE = 0.05
+
+
+class PermutationIndividual(IntVectorIndividual):
+    __slots__ = ()
+
+    def compute_fitness(self) -> float:
+        self.fitness = 0
+        return self.fitness
+
+    def better_than(self, other: "PermutationIndividual") -> bool:
+        return False
+
+
+class PermutationProblem(Problem):
+
+    def __init__(self, num_genes: int):
+        self.num_genes = num_genes
+
+    def generate_individual(self, rand: Random) -> PermutationIndividual:
+        genome = list(range(self.num_genes))
+        rand.shuffle(genome)
+        return self.build_individual(genome)
+
+    def build_individual(self, genome) -> PermutationIndividual:
+        ind = PermutationIndividual(self, self.num_genes)
+        ind.genome = genome
+        return ind
+
+
+def build_population(individuals: list) -> Population:
+    population = Population(len(individuals))
+    population.individuals = individuals
+    return population
+
+
+def get_genomes(population: Population) -> [tuple]:
+    return [tuple(ind.genome) for ind in population.individuals]
+
+
+@pytest.mark.parametrize('num_genes', NUM_GENES)
+@pytest.mark.parametrize('operator', OPERATORS, ids=str)
+@pytest.mark.parametrize('batch', [False, True], ids=['loop', 'batch'])
+def test_children_are_permutations(operator, num_genes: int, batch: bool):
+    for seed in SEEDS:
+        rand = Random(seed)
+        population = Population(POPULATION_SIZE, PermutationProblem(num_genes), rand)
+        parents = get_genomes(population)
+        for ind in population.individuals:
+            ind.dirty = False
+
+        if batch:
+            operator.run_batch(population, rand)
+        else:
+            operator.run(population, rand)
+
+        for ind, parent in zip(population.individuals, parents):
+            assert sorted(ind.genome) == list(range(num_genes))
+            assert len(ind.genome) == ind.num_genes
+            if tuple(ind.genome) != parent:
+                assert ind.dirty
+
+
+def count_children(operator, parents: list, batch: bool) -> Counter:
+    # Recombinations are counted by both children of a pair, mutations by every child
+    problem = parents[0].problem
+    population = build_population([problem.build_individual(list(parents[i % len(parents)].genome))
+                                   for i in range(SAMPLES)])
+    if batch:
+        operator.run_batch(population, Random(1))
+    else:
+        operator.run(population, Random(2))
+    genomes = get_genomes(population)
+    if len(parents) == 2:
+        return Counter(zip(genomes[0::2], genomes[1::2]))
+    return Counter(genomes)
+
+
+@pytest.mark.parametrize('num_genes', [1, 2, 3, 4, 5])
+@pytest.mark.parametrize('operator', OPERATORS, ids=str)
+def test_batch_children_distribution(operator, num_genes: int):
+    problem = PermutationProblem(num_genes)
+    rand = Random(num_genes)
+    recombination = operator.__class__.__name__.startswith('Recombination')
+    parents = [problem.generate_individual(rand) for _ in range(2 if recombination else 1)]
+
+    loop_counts = count_children(operator, parents, False)
+    batch_counts = count_children(operator, parents, True)
+    loop_total, batch_total = sum(loop_counts.values()), sum(batch_counts.values())
+    distance = sum(abs(loop_counts[child] / loop_total - batch_counts[child] / batch_total)
+                   for child in loop_counts.keys() | batch_counts.keys()) / 2
+    assert distance < TOLERANCE
+
+
+@pytest.mark.parametrize('num_genes', NUM_GENES)
+def test_ox1_and_cx_batch_children_match_loop(num_genes: int):
+    # Both take their random choices as arguments, so the children of the same choices are compared one by one
+    rand = np.random.default_rng(num_genes)
+    population = Population(POPULATION_SIZE, PermutationProblem(num_genes), Random(num_genes))
+    ind1, ind2 = population.individuals[0::2], population.individuals[1::2]
+    count = len(ind1)
+    genomes1 = population.get_genomes(np.arange(0, POPULATION_SIZE, 2))
+    genomes2 = population.get_genomes(np.arange(1, POPULATION_SIZE, 2))
+
+    if num_genes > 1:
+        cut1, cut2 = RecombinationOX1.random_cuts_batch(rand, count, num_genes, True)
+        children = (RecombinationOX1.fill_batch(genomes1, genomes2, cut1, cut2),
+                    RecombinationOX1.fill_batch(genomes2, genomes1, cut1, cut2))
+        for k in range(count):
+            expected = RecombinationOX1.recombine_parents(ind1[k], ind2[k], int(cut1[k, 0]), int(cut2[k, 0]))
+            assert [children[0][k].tolist(), children[1][k].tolist()] == list(expected)
+
+    start_with_ind1 = rand.integers(0, 2, count).astype(bool)[:, None]
+    children = RecombinationCX.recombine_parents_batch(np.where(start_with_ind1, genomes1, genomes2),
+                                                       np.where(start_with_ind1, genomes2, genomes1))
+    for k in range(count):
+        expected = RecombinationCX.recombine_parent(ind1[k], ind2[k], bool(start_with_ind1[k, 0]))
+        assert [children[0][k].tolist(), children[1][k].tolist()] == list(expected)
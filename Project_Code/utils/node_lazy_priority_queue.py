@@ -0,0 +1,80 @@
+import heapq
+from itertools import count
+
+from agentsearch.state import State
+from search_methods.node import Node
+from utils.node_collection import NodeCollection
+
+
+#  Like NodePriorityQueue, but deleted entries are only marked as stale and skipped when they reach the top of the
+#  heap. Entries are [f, -counter, node]: ties go to the newest (deepest) node and nodes are never compared.
+#  When more than half of the heap is stale it is rebuilt with the live entries only.
+
+
+class NodeLazyPriorityQueue(NodeCollection):
+
+    def __init__(self):
+        super().__init__()
+        self._counter = count()
+        self._stale = 0
+
+    def append(self, item: Node) -> None:
+        if item.state in self._dictionary:
+            del self[item.state]
+
+        entry = [item.f, -next(self._counter), item]
+        self._dictionary[item.state] = entry
+        heapq.heappush(self._list, entry)
+
+    def pop(self):
+        while self._list:
+            item = heapq.heappop(self._list)[2]
+            if item is None:
+                self._stale -= 1
+                continue
+
+            self._dictionary.pop(item.state)
+            return item
+
+        raise Exception('Trying to pop from empty PriorityQueue.')
+
+    def clear(self):
+        super().clear()
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._dictionary)
+
+    def __getitem__(self, key: State):
+        return self._dictionary.get(key)[2]
+
+    def __delitem__(self, key: State):
+        if not self._dictionary:
+            raise Exception('Trying to delete from empty PriorityQueue.')
+        try:
+            entry = self._dictionary.pop(key)
+        except KeyError:
+            raise KeyError(str(key) + ' is not in the priority queue.')
+
+        entry[2] = None
+        self._stale += 1
+        if self._stale > len(self._list) // 2:
+            self.compact()
+
+    def remove_last(self):
+        # Removing the last element of a heap keeps the heap property, no heapify is needed
+        while self._list:
+            item = self._list.pop()[2]
+            if item is None:
+                self._stale -= 1
+                continue
+
+            self._dictionary.pop(item.state)
+            return item
+
+        raise Exception('Trying to delete from empty PriorityQueue.')
+
+    def compact(self) -> None:
+        self._list = [entry for entry in self._list if entry[2] is not None]
+        heapq.heapify(self._list)
+        self._stale = 0
@@ -0,0 +1,58 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from agentsearch.action import Action
+from warehouse.actions import ActionDown, ActionUp, ActionRight, ActionLeft, ActionNoMove
+
+# Same order as WarehouseProblemSearch.actions, the index of a move is its code in encoded paths.
+# Opposite moves only differ in the last bit: DOWN 0 / UP 1, RIGHT 2 / LEFT 3.
+MOVES = [(1, 0, ActionDown), (-1, 0, ActionUp), (0, 1, ActionRight), (0, -1, ActionLeft)]
+# Waits of space-time paths come after the moves, those paths are never walked backwards
+WAIT = len(MOVES)
+MOVE_CODES = {action_type: code for code, (_, _, action_type) in enumerate(MOVES)}
+MOVE_CODES[ActionNoMove] = WAIT
+# Line and column change of every code
+MOVE_LINES = np.array([line for line, _, _ in MOVES] + [0])
+MOVE_COLUMNS = np.array([column for _, column, _ in MOVES] + [0])
+
+# Actions keep no state, so paths share one instance per code
+ACTIONS = [action_type() for _, _, action_type in MOVES] + [ActionNoMove()]
+ACTION_COSTS = np.array([action.cost for action in ACTIONS])
+
+
+def encode_actions(actions: [Action]) -> bytes:
+    return bytes(MOVE_CODES[type(action)] for action in actions)
+
+
+class ActionPath(Sequence):
+    # Read only view of an encoded path, optionally walked backwards with every move inverted
+
+    def __init__(self, path: bytes, reverse: bool = False):
+        self.path = path
+        self.reverse = reverse
+
+    def __len__(self):
+        return len(self.path)
+
+    def __getitem__(self, index: int) -> Action:
+        if index < 0:
+            index += len(self.path)
+        if not 0 <= index < len(self.path):
+            raise IndexError('ActionPath index out of range')
+
+        if self.reverse:
+            return ACTIONS[self.path[len(self.path) - 1 - index] ^ 1]
+        return ACTIONS[self.path[index]]
+
+    def __iter__(self):
+        if self.reverse:
+            return (ACTIONS[code ^ 1] for code in reversed(self.path))
+        return (ACTIONS[code] for code in self.path)
+
+    def __reversed__(self):
+        return iter(ActionPath(self.path, not self.reverse))
+
+    def get_codes(self) -> np.ndarray:
+        codes = np.frombuffer(self.path, dtype=np.uint8)
+        return codes[::-1] ^ 1 if self.reverse else codes
@@ -0,0 +1,294 @@
+import heapq
+import time
+from math import inf
+
+import numpy as np
+
+import constants
+from agentsearch.action import Action
+from warehouse.action_path import ACTION_COSTS, ACTIONS, MOVE_CODES, MOVE_COLUMNS, MOVE_LINES, WAIT
+from warehouse.cell import Cell
+from warehouse.constraint_tree_node import ConstraintTreeNode
+
+# Conflict-Based Search of collision free timed paths for the routes of an individual.
+# Every forklift visits its products in genome order and then drives to the exit, where it leaves the warehouse.
+# Time goes in rounds and, like in the collision check simulation, forklifts move one after the other in index
+# order. So two forklifts conflict when they end a round in the same cell, or when one moves into the cell another
+# one has not left yet. Either way one (forklift, cell, time) position must be avoided by one of them, both
+# options are branches of the constraint tree. The exit never conflicts.
+# Paths of the low level are space-time A* over (cell, next target, time) with waits in place, costs are the
+# action costs of the fitness. With suboptimality w > 1 this is ECBS: both levels pick, among the nodes within w
+# times their lower bound, the one with the fewest conflicts, and the plan costs at most w times the optimum.
+
+CHECK_INTERVAL = 256
+
+
+class ConflictBasedSearch:
+
+    def __init__(self, agent_search: "WarehouseAgentSearch", suboptimality: float = 1, time_limit: float | None = 5):
+        self.agent = agent_search
+        self.suboptimality = suboptimality
+        self.time_limit = time_limit
+        grid = agent_search.grid
+        self.rows, self.columns = grid.shape
+        self.walkable = (grid == constants.EMPTY) | (grid == constants.EXIT)
+        self.exit = (agent_search.exit.line, agent_search.exit.column)
+        # (cell, action cost) of every move from each walkable cell, waiting in place included
+        self.successors = {}
+        for line, column in zip(*np.nonzero(self.walkable)):
+            successors = []
+            for code in range(WAIT + 1):
+                new_line = int(line + MOVE_LINES[code])
+                new_column = int(column + MOVE_COLUMNS[code])
+                if 0 <= new_line < self.rows and 0 <= new_column < self.columns and \
+                        self.walkable[new_line, new_column]:
+                    successors.append(((new_line, new_column), int(ACTION_COSTS[code])))
+            self.successors[(int(line), int(column))] = successors
+        # Distances to the goal cells of every target, shared by the searches
+        self.fields = {}
+        self.deadline = None
+        # Statistics of the last search
+        self.timed_out = False
+        self.expanded_nodes = 0
+        self.cost = None
+        self.makespan = None
+
+    def solve(self, individual: "WarehouseIndividual") -> list | None:
+        # Actions of every forklift, None if there is no plan or the time limit ends the search first
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self.timed_out = False
+        self.expanded_nodes = 0
+        self.cost = self.makespan = None
+
+        starts, targets = self.build_targets(individual)
+        num_forklifts = len(starts)
+        root = ConstraintTreeNode([frozenset()] * num_forklifts, [[] for _ in range(num_forklifts)],
+                                  [0] * num_forklifts, [0] * num_forklifts)
+        for forklift in range(num_forklifts):
+            path, cost, lower_bound = self.find_path(forklift, starts, targets, frozenset(), root.paths)
+            if path is None:
+                return None
+            root = root.replace_path(forklift, frozenset(), path, cost, lower_bound)
+        self.find_conflicts(root)
+
+        counter = 0
+        open_nodes = [(root.lower_bound, counter, root)]
+        while open_nodes:
+            if self.is_time_over():
+                return None
+
+            # FOCAL: the nodes within suboptimality times the lowest bound, the fewest conflicts go first
+            bound = self.suboptimality * open_nodes[0][0]
+            _, _, node = min((entry for entry in open_nodes if entry[2].cost <= bound),
+                             key=lambda entry: (entry[2].num_conflicts, entry[2].cost, entry[1]))
+            open_nodes.remove(next(entry for entry in open_nodes if entry[2] is node))
+            heapq.heapify(open_nodes)
+            self.expanded_nodes += 1
+
+            if node.conflict is None:
+                self.cost = node.cost
+                self.makespan = max(len(path) for path in node.paths) - 1
+                return [self.build_actions(path) for path in node.paths]
+
+            for forklift, cell, t in node.conflict:
+                constraints = node.constraints[forklift] | {(cell, t)}
+                path, cost, lower_bound = self.find_path(forklift, starts, targets, constraints, node.paths)
+                if path is None:
+                    if self.timed_out:
+                        return None
+                    continue
+                child = node.replace_path(forklift, constraints, path, cost, lower_bound)
+                self.find_conflicts(child)
+                counter += 1
+                heapq.heappush(open_nodes, (child.lower_bound, counter, child))
+        return None
+
+    def is_time_over(self) -> bool:
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    def build_targets(self, individual: "WarehouseIndividual") -> ([tuple], [list]):
+        # Start cell and (goal cells, distances, remaining cost bound) of every target of every forklift
+        forklifts = self.agent.forklifts
+        cells = forklifts + self.agent.products + [self.agent.exit]
+        routes = [[] for _ in forklifts]
+        for forklift, _, target_id in individual.get_route_legs():
+            routes[forklift].append(cells[target_id])
+
+        targets = []
+        for route in routes:
+            fields = [self.get_field(cell) for cell in route]
+            # Lower bound of the trips after each target, from its closest goal cell to the next target
+            rests = [0] * len(route)
+            for m in range(len(route) - 2, -1, -1):
+                goals, _ = fields[m]
+                _, next_distances = fields[m + 1]
+                rests[m] = rests[m + 1] + min(next_distances[line][column] for line, column in goals)
+            targets.append([(goals, distances, rest) for (goals, distances), rest in zip(fields, rests)])
+        return [(forklift.line, forklift.column) for forklift in forklifts], targets
+
+    def get_field(self, target: Cell) -> (frozenset, [[float]]):
+        # Goal cells of a target and the distance of every cell to them, shared with the replanning heuristic
+        key = (target.line, target.column)
+        if key not in self.fields:
+            goals = frozenset((goal.line, goal.column) for goal in self.agent.get_goal_cells(target))
+            self.fields[key] = (goals, self.agent.get_target_distances(target))
+        return self.fields[key]
+
+    def find_path(self, forklift: int, starts: [tuple], targets: [list], constraints: frozenset,
+                  paths: [list]) -> (list | None, int, float):
+        # Focal space-time A*: path, its cost and the lower bound of the optimal cost for the forklift
+        forklift_targets = targets[forklift]
+        num_targets = len(forklift_targets)
+        occupancy = {}
+        horizon = max((t for _, t in constraints), default=0)
+        for other, path in enumerate(paths):
+            if other != forklift:
+                horizon = max(horizon, len(path))
+                for t, cell in enumerate(path):
+                    occupancy.setdefault((cell, t), []).append(other)
+        horizon += 1
+
+        def advance(cell: tuple, m: int) -> int:
+            while m < num_targets and cell in forklift_targets[m][0]:
+                m += 1
+            return m
+
+        def heuristic(cell: tuple, m: int) -> float:
+            if m == num_targets:
+                return 0
+            _, distances, rest = forklift_targets[m]
+            return distances[cell[0]][cell[1]] + rest
+
+        start = starts[forklift]
+        m = advance(start, 0)
+        f = heuristic(start, m)
+        if f == inf or (start, 0) in constraints:
+            return None, 0, inf
+
+        # Nodes are (cell, next target, time, cost, conflicts, parent index)
+        nodes = [(start, m, 0, 0, 0, -1)]
+        open_costs = [(f, 0)]
+        focal = [(0, f, 0)]
+        pending = []
+        expanded = [False]
+        closed = set()
+        bound = self.suboptimality * f
+        iterations = 0
+        while True:
+            while open_costs and expanded[open_costs[0][1]]:
+                heapq.heappop(open_costs)
+            if not open_costs:
+                return None, 0, inf
+            lower_bound = open_costs[0][0]
+            bound = max(bound, self.suboptimality * lower_bound)
+            while pending and pending[0][0] <= bound:
+                f, index = heapq.heappop(pending)
+                heapq.heappush(focal, (nodes[index][4], f, index))
+
+            _, f, index = heapq.heappop(focal)
+            if expanded[index]:
+                continue
+            expanded[index] = True
+            cell, m, t, g, conflicts, _ = nodes[index]
+            key = (cell, m, min(t, horizon))
+            if key in closed:
+                continue
+            closed.add(key)
+
+            if m == num_targets:
+                return self.rebuild_path(nodes, index), g, lower_bound
+
+            iterations += 1
+            if iterations % CHECK_INTERVAL == 0 and self.is_time_over():
+                return None, 0, inf
+
+            for new_cell, cost in self.successors[cell]:
+                if (new_cell, t + 1) in constraints:
+                    continue
+                new_m = advance(new_cell, m)
+                if (new_cell, new_m, min(t + 1, horizon)) in closed:
+                    continue
+                h = heuristic(new_cell, new_m)
+                if h == inf:
+                    continue
+
+                new_g = g + cost
+                new_conflicts = conflicts + self.count_conflicts(forklift, cell, new_cell, t, occupancy)
+                nodes.append((new_cell, new_m, t + 1, new_g, new_conflicts, index))
+                expanded.append(False)
+                new_index = len(nodes) - 1
+                heapq.heappush(open_costs, (new_g + h, new_index))
+                if new_g + h <= bound:
+                    heapq.heappush(focal, (new_conflicts, new_g + h, new_index))
+                else:
+                    heapq.heappush(pending, (new_g + h, new_index))
+
+    def count_conflicts(self, forklift: int, cell: tuple, new_cell: tuple, t: int, occupancy: dict) -> int:
+        # Conflicts of one move with the paths of the other forklifts, see find_conflicts
+        conflicts = 0
+        if new_cell != self.exit:
+            conflicts += len(occupancy.get((new_cell, t + 1), ()))
+            if new_cell != cell:
+                conflicts += sum(other > forklift for other in occupancy.get((new_cell, t), ()))
+        if cell != self.exit and new_cell != cell:
+            conflicts += sum(other < forklift for other in occupancy.get((cell, t + 1), ()))
+        return conflicts
+
+    def find_conflicts(self, node: ConstraintTreeNode) -> None:
+        # Forklift i moves before forklift j > i in every round, they conflict when at time t + 1 i is where j is at
+        # time t + 1 (both in one cell) or at time t (i drives into j, which has not moved yet)
+        paths = node.paths
+        node.num_conflicts = 0
+        node.conflict = None
+        for t in range(max(len(path) for path in paths) - 1):
+            before = {}
+            after = {}
+            for forklift, path in enumerate(paths):
+                if t < len(path):
+                    before[path[t]] = forklift
+                if t + 1 < len(path):
+                    cell = path[t + 1]
+                    if cell == self.exit:
+                        continue
+                    if cell in after:
+                        self.add_conflict(node, (after[cell], cell, t + 1), (forklift, cell, t + 1))
+                    else:
+                        after[cell] = forklift
+            for cell, forklift in after.items():
+                other = before.get(cell)
+                if other is not None and other > forklift:
+                    self.add_conflict(node, (forklift, cell, t + 1), (other, cell, t))
+
+    @staticmethod
+    def add_conflict(node: ConstraintTreeNode, first: tuple, second: tuple) -> None:
+        node.num_conflicts += 1
+        if node.conflict is None:
+            node.conflict = (first, second)
+
+    @staticmethod
+    def rebuild_path(nodes: list, index: int) -> [tuple]:
+        path = []
+        while index != -1:
+            path.append(nodes[index][0])
+            index = nodes[index][5]
+        path.reverse()
+        return path
+
+    @staticmethod
+    def build_actions(path: [tuple]) -> [Action]:
+        actions = []
+        for (line, column), (new_line, new_column) in zip(path, path[1:]):
+            if (new_line, new_column) == (line, column):
+                actions.append(ACTIONS[WAIT])
+            else:
+                code = next(code for code in MOVE_CODES.values()
+                            if MOVE_LINES[code] == new_line - line and MOVE_COLUMNS[code] == new_column - column)
+                actions.append(ACTIONS[code])
+        return actions
+
+    def __str__(self):
+        if self.suboptimality > 1:
+            return f'ECBS ({self.suboptimality})'
+        return 'CBS'
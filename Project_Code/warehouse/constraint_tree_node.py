@@ -0,0 +1,26 @@
+class ConstraintTreeNode:
+    # Node of the high level search of ConflictBasedSearch: (cell, time) positions every forklift must avoid and
+    # the paths found under them, with the cost and the lower bound of every path
+
+    def __init__(self, constraints: [frozenset], paths: [list], costs: [int], lower_bounds: [float]):
+        self.constraints = constraints
+        self.paths = paths
+        self.costs = costs
+        self.lower_bounds = lower_bounds
+        self.cost = sum(costs)
+        self.lower_bound = sum(lower_bounds)
+        self.num_conflicts = 0
+        # Both ways to solve the first conflict, (forklift, cell, time) each
+        self.conflict = None
+
+    def replace_path(self, forklift: int, constraints: frozenset, path: list, cost: int,
+                     lower_bound: float) -> "ConstraintTreeNode":
+        all_constraints = list(self.constraints)
+        paths = list(self.paths)
+        costs = list(self.costs)
+        lower_bounds = list(self.lower_bounds)
+        all_constraints[forklift] = constraints
+        paths[forklift] = path
+        costs[forklift] = cost
+        lower_bounds[forklift] = lower_bound
+        return ConstraintTreeNode(all_constraints, paths, costs, lower_bounds)
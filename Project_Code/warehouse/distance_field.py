@@ -0,0 +1,68 @@
+from collections import deque
+
+import numpy as np
+
+from warehouse.action_path import MOVES
+from warehouse.cell import Cell
+from warehouse.warehouse_state import WarehouseState
+
+
+class DistanceField:
+    # Breadth-first flood from a single source cell over the grid of the given state.
+    # Every cell keeps its distance to the source and the move used to reach it,
+    # so the path to any target can be rebuilt without a new search.
+
+    def __init__(self, state: WarehouseState, source: Cell):
+        self.source = source
+        self.rows = state.rows
+        self.columns = state.columns
+        self.distances = np.full((self.rows, self.columns), -1, dtype=int)
+        self.moves = np.full((self.rows, self.columns), -1, dtype=np.int8)
+
+        self.distances[source.line][source.column] = 0
+        frontier = deque([(source.line, source.column)])
+        while frontier:
+            line, column = frontier.popleft()
+            distance = self.distances[line][column] + 1
+            for move_index, (d_line, d_column, _) in enumerate(MOVES):
+                new_line = line + d_line
+                new_column = column + d_column
+                if not (0 <= new_line < self.rows and 0 <= new_column < self.columns):
+                    continue
+
+                if self.distances[new_line][new_column] != -1 or not state.is_movable_cell(new_line, new_column):
+                    continue
+
+                self.distances[new_line][new_column] = distance
+                self.moves[new_line][new_column] = move_index
+                frontier.append((new_line, new_column))
+
+    def get_distance(self, cell: Cell) -> int:
+        return self.distances[cell.line][cell.column]
+
+    def get_goal(self, target: Cell, is_exit: bool) -> Cell | None:
+        # Mirrors WarehouseProblemSearch.is_goal: the exit must be reached, products only need to be side by side
+        if is_exit:
+            candidates = [target]
+        else:
+            candidates = [Cell(target.line, target.column + offset) for offset in (-1, 0, 1)
+                          if 0 <= target.column + offset < self.columns]
+
+        goal = None
+        for cell in candidates:
+            distance = self.get_distance(cell)
+            if distance != -1 and (goal is None or distance < self.get_distance(goal)):
+                goal = cell
+        return goal
+
+    def get_path(self, cell: Cell) -> bytes:
+        # Move codes from the source to the cell
+        path = bytearray()
+        line, column = cell.line, cell.column
+        while self.moves[line][column] != -1:
+            move_index = self.moves[line][column]
+            path.append(move_index)
+            line -= MOVES[move_index][0]
+            column -= MOVES[move_index][1]
+        path.reverse()
+        return bytes(path)
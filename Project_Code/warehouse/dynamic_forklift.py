@@ -1,6 +1,9 @@
 from copy import copy
 
+import numpy as np
+
 from agentsearch.action import Action
+from warehouse.action_path import ActionPath
 from warehouse.cell import Cell
 
 
@@ -13,7 +16,7 @@ class DynamicForklift:
         self.current_action_index = 0
         self.current_target_index = 0
 
-    def append_target(self, cell: Cell, info: [int | Action]):
+    def append_target(self, cell: Cell, info: ActionPath):
         self.targets_info.append((cell, info))
 
     def get_actions(self) -> [Action]:
@@ -57,7 +60,25 @@ class DynamicForklift:
         self.current_target_index += 1
         self.current_action_index = 0
 
-    def update_target(self, actions: [Action]):
+    def get_remaining_codes(self) -> np.ndarray:
+        # Move codes of the actions still to take, over all targets
+        codes = [actions.get_codes() for _, actions in self.targets_info[self.current_target_index:]]
+        if not codes:
+            return np.empty(0, dtype=np.uint8)
+        codes[0] = codes[0][self.current_action_index:]
+        return np.concatenate(codes)
+
+    def skip_actions(self, count: int):
+        # Same position in the targets as count calls of next_action, moving to the next target when needed
+        while count > 0:
+            remaining = len(self.get_actions()) - self.current_action_index
+            if count <= remaining:
+                self.current_action_index += count
+                return
+            count -= remaining
+            self.next_target()
+
+    def update_target(self, actions: ActionPath):
         target = self.get_target()
         if target is None:
             return
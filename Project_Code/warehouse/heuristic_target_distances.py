@@ -0,0 +1,24 @@
+from agentsearch.heuristic import Heuristic
+from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
+from warehouse.warehouse_state import WarehouseState
+
+
+class HeuristicTargetDistances(Heuristic[WarehouseProblemSearch, WarehouseState]):
+    # True distance to the goal cells of the target on the static grid, see WarehouseAgentSearch.get_target_distances.
+    # Other forklifts as obstacles only make paths longer, so it never overestimates and it stays consistent.
+
+    def __init__(self, agent_search: "WarehouseAgentSearch"):
+        super().__init__()
+        self.agent_search = agent_search
+        self.distances = None
+
+    @Heuristic.problem.setter
+    def problem(self, problem: WarehouseProblemSearch):
+        self._problem = problem
+        self.distances = self.agent_search.get_target_distances(problem.goal_position)
+
+    def compute(self, state: WarehouseState) -> float:
+        return self.distances[state.line_forklift][state.column_forklift]
+
+    def __str__(self):
+        return "Distance to goal cells on the static grid"
@@ -1,15 +1,38 @@
-from warehouse.actions import *
+from typing import Callable
+
+from warehouse.action_path import ActionPath
 from warehouse.cell import Cell
 
 
 class Pair:
     def __init__(self, cell1: Cell, cell2: Cell):
-        self.actions = []
-        self.actions_reversed = []
+        self._path = b''
+        # Searches the path the first time it is used, when only the value was computed
+        self.find_path = None
         self.cell1 = cell1
         self.cell2 = cell2
         self.value = 0
 
+    @property
+    def path(self) -> bytes:
+        find_path = self.find_path
+        if find_path is not None:
+            self._path = find_path(self)
+            self.find_path = None
+        return self._path
+
+    @property
+    def has_path(self) -> bool:
+        return self.find_path is None
+
+    @property
+    def actions(self) -> ActionPath:
+        return ActionPath(self.path)
+
+    @property
+    def actions_reversed(self) -> ActionPath:
+        return ActionPath(self.path, True)
+
     def hash(self):
         return str(self.cell1.line) + "_" + str(self.cell1.column) + "_" + str(
             self.cell2.line) + "_" + str(self.cell2.column)
@@ -17,9 +40,8 @@ class Pair:
     def __str__(self):
         string = f'{self.cell1.line}-{self.cell1.column} / {self.cell2.line}-{self.cell2.column}: {self.value}->'
 
-        num_actions = len(self.actions)
-        for a in range(num_actions):
-            action = self.actions[a]
+        num_actions = len(self.path)
+        for a, action in enumerate(self.actions):
             string += f'{action}'
             if a + 1 < num_actions:
                 string += ','
@@ -27,16 +49,14 @@ class Pair:
         string += '\n'
         return string
 
-    def invert_actions(self):
-        for action in self.actions[::-1]:
-            if type(action) == ActionUp:
-                self.actions_reversed.append(ActionDown())
-            elif type(action) == ActionDown:
-                self.actions_reversed.append(ActionUp())
-            elif type(action) == ActionLeft:
-                self.actions_reversed.append(ActionRight())
-            elif type(action) == ActionRight:
-                self.actions_reversed.append(ActionLeft())
+    def set_path(self, value: int, path: bytes):
+        self.value = value
+        self._path = path
+        self.find_path = None
+
+    def set_value(self, value: int, find_path: Callable[["Pair"], bytes]):
+        self.value = value
+        self.find_path = find_path
 
     def is_pair(self, cell1: Cell, cell2: Cell):
         return self.cell1.is_cell(cell1) and self.cell2.is_cell(cell2)
@@ -0,0 +1,58 @@
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+# Pair distances and paths saved next to the data set, so a map is only searched once.
+# Paths are stored as move codes concatenated in pairs order, with one offset per pair. Distance fields mode only
+# knows the values, its paths are not stored and are searched when used, like after the floods. Both modes give the
+# same values and paths, so they share the file.
+
+
+def get_map_fingerprint(matrix: np.ndarray) -> str:
+    # Pair searches always allow collisions, so the collision setting does not change the result
+    fingerprint = hashlib.sha1(str(matrix.shape).encode())
+    fingerprint.update(np.ascontiguousarray(matrix, dtype=np.int8).tobytes())
+    return fingerprint.hexdigest()
+
+
+def get_pairs_cache_filename(problem_filename: str, matrix: np.ndarray) -> str:
+    root, _ = os.path.splitext(problem_filename)
+    return f'{root}.{get_map_fingerprint(matrix)[:16]}.pairs.npz'
+
+
+def save_pairs(agent_search: "WarehouseAgentSearch", filename: str, fingerprint: str) -> None:
+    values = np.array([pair.value for pair in agent_search.pairs], dtype=np.int32)
+    known = np.array([pair.has_path for pair in agent_search.pairs], dtype=bool)
+    offsets = np.zeros(len(agent_search.pairs) + 1, dtype=np.int64)
+    codes = bytearray()
+    for i, pair in enumerate(agent_search.pairs):
+        if pair.has_path:
+            codes += pair.path
+        offsets[i + 1] = len(codes)
+
+    np.savez_compressed(filename, fingerprint=np.array(fingerprint), values=values, known=known, offsets=offsets,
+                        codes=np.frombuffer(codes, dtype=np.int8), distances=agent_search.distances)
+
+
+def load_pairs(agent_search: "WarehouseAgentSearch", filename: str, fingerprint: str) -> bool:
+    if not os.path.isfile(filename):
+        return False
+
+    try:
+        with np.load(filename) as data:
+            if str(data['fingerprint']) != fingerprint or len(data['values']) != len(agent_search.pairs):
+                return False
+            values, known, offsets = data['values'], data['known'], data['offsets']
+            codes, distances = data['codes'], data['distances']
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return False
+
+    agent_search.set_pairs_values(values.tolist())
+    for i, pair in enumerate(agent_search.pairs):
+        if known[i]:
+            pair.set_path(int(values[i]), codes[offsets[i]:offsets[i + 1]].tobytes())
+
+    agent_search.distances[:] = distances
+    return True
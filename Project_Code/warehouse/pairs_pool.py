@@ -0,0 +1,107 @@
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from agentsearch.agent import Agent
+from warehouse.action_path import encode_actions
+from warehouse.cell import Cell
+from warehouse.distance_field import DistanceField
+from warehouse.heuristic_warehouse import HeuristicWarehouse
+from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
+from warehouse.warehouse_search_state import WarehouseSearchState
+
+# Pair distances computed by a pool of worker processes.
+# The static grid is placed once in shared memory and every worker maps it on start, tasks only carry positions.
+# Paths come back as encoded moves and are stored in the pairs by the main process. Floods only send values back,
+# the main process searches their paths when they are used, see WarehouseAgentSearch.search_pair_path.
+
+_worker_memory = None
+_worker_grid = None
+_worker_exit = None
+_worker_agent = None
+
+
+def init_worker(memory_name: str, shape: tuple, dtype: str, exit_cell: (int, int)) -> None:
+    global _worker_memory, _worker_grid, _worker_exit, _worker_agent
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_grid = np.ndarray(shape, dtype=dtype, buffer=_worker_memory.buf)
+    _worker_grid.flags.writeable = False
+    _worker_exit = exit_cell
+    _worker_agent = Agent()
+    _worker_agent.heuristic = HeuristicWarehouse()
+
+
+def build_worker_state(line: int, column: int, obstacles: frozenset = frozenset()) -> WarehouseSearchState:
+    return WarehouseSearchState(_worker_grid, line, column, _worker_exit[0], _worker_exit[1], True, obstacles)
+
+
+def search_pair(task: tuple) -> (int, bytes):
+    start_line, start_column, obstacles, goal_line, goal_column = task
+    problem = WarehouseProblemSearch(build_worker_state(start_line, start_column, obstacles),
+                                     Cell(goal_line, goal_column))
+    solution = _worker_agent.solve_problem(problem)
+    return solution.cost, encode_actions(solution.actions)
+
+
+def flood_source(task: tuple) -> [int]:
+    start_line, start_column, targets = task
+    field = DistanceField(build_worker_state(start_line, start_column), Cell(start_line, start_column))
+    values = []
+    for goal_line, goal_column, is_exit in targets:
+        goal = field.get_goal(Cell(goal_line, goal_column), is_exit)
+        values.append(int(field.get_distance(goal)))
+    return values
+
+
+def calculate_pairs_in_pool(agent_search: "WarehouseAgentSearch", state: "WarehouseState",
+                            use_distance_fields: bool, workers: int | None) -> None:
+    workers = workers or os.cpu_count()
+    grid = agent_search.grid
+    memory = shared_memory.SharedMemory(create=True, size=grid.nbytes)
+    try:
+        np.ndarray(grid.shape, dtype=grid.dtype, buffer=memory.buf)[:] = grid
+        init_arguments = (memory.name, grid.shape, grid.dtype.str, (agent_search.exit.line, agent_search.exit.column))
+        with Pool(workers, initializer=init_worker, initargs=init_arguments) as pool:
+            if use_distance_fields:
+                values = calculate_fields_in_pool(agent_search, state, pool, workers)
+            else:
+                paths = calculate_searches_in_pool(agent_search, state, pool, workers)
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if use_distance_fields:
+        agent_search.set_pairs_values(values)
+    else:
+        for pair, (value, codes) in zip(agent_search.pairs, paths):
+            pair.set_path(value, codes)
+
+
+def calculate_searches_in_pool(agent_search: "WarehouseAgentSearch", state: "WarehouseState", pool: Pool,
+                               workers: int) -> [(int, bytes)]:
+    # Same start cells and forklift obstacles as WarehouseAgentSearch.calculate_pairs_distances_with_search
+    tasks = []
+    for pair, (start, obstacles) in zip(agent_search.pairs, agent_search.get_pair_search_starts(state)):
+        tasks.append((start.line, start.column, obstacles, pair.cell2.line, pair.cell2.column))
+
+    return pool.map(search_pair, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+
+def calculate_fields_in_pool(agent_search: "WarehouseAgentSearch", state: "WarehouseState", pool: Pool,
+                             workers: int) -> [int]:
+    # One task per source cell, the results are put back in pairs order
+    sources = {}
+    for index, pair in enumerate(agent_search.pairs):
+        start = agent_search.get_search_start(state, pair.cell1)
+        targets = sources.setdefault((start.line, start.column), [])
+        targets.append((index, pair.cell2.line, pair.cell2.column, pair.cell2.is_cell(agent_search.exit)))
+
+    tasks = [(line, column, [target[1:] for target in targets]) for (line, column), targets in sources.items()]
+    results = pool.map(flood_source, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+
+    values = [0] * len(agent_search.pairs)
+    for targets, source_values in zip(sources.values(), results):
+        for target, value in zip(targets, source_values):
+            values[target[0]] = value
+    return values
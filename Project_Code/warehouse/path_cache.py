@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+
+# Paths of the collision check replanning searches, the least recently used entries are dropped past max_size.
+# Keys are (line, column, target line, target column). A search only knows the obstacles in the cells it looked at,
+# so every entry keeps those cells, the obstacles it found there and the path: the same path is found for any
+# obstacles that match them there. Up to MAX_VARIANTS of these are kept per key, paths are None when there is none.
+# GA runs in threads share the cache, worker processes start with an empty one.
+
+MAX_VARIANTS = 8
+
+
+class PathCache:
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def get(self, key: tuple, obstacles: frozenset,
+            search: Callable[[], tuple[bytes | None, frozenset]]) -> bytes | None:
+        # search returns the path and the cells the search looked at
+        with self.lock:
+            variants = self.entries.get(key)
+            if variants is not None:
+                self.entries.move_to_end(key)
+                for looked_at, found, path in variants:
+                    if obstacles & looked_at == found:
+                        self.hits += 1
+                        return path
+            self.misses += 1
+
+        path, looked_at = search()
+        with self.lock:
+            variants = self.entries.setdefault(key, [])
+            variants.insert(0, (looked_at, obstacles & looked_at, path))
+            del variants[MAX_VARIANTS:]
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return path
+
+    def get_hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getstate__(self):
+        return self.max_size
+
+    def __setstate__(self, max_size: int):
+        self.__init__(max_size)
+
+    def __str__(self):
+        return f'{len(self.entries)}/{self.max_size} keys, {self.hits} hits, {self.misses} misses ' \
+               f'({self.get_hit_rate():.1%})'
@@ -0,0 +1,149 @@
+import numpy as np
+
+import constants
+from warehouse.action_path import MOVE_LINES, MOVE_COLUMNS, WAIT
+from warehouse.cell import Cell
+
+# Space-time reservations of the simulation with space-time replanning: the cell every forklift holds before each of
+# its turns if it follows its plan, one row per forklift, turns as columns. Cells are ids line * columns + column.
+# Forklifts take turns round robin from the first one, so turn k of forklift f is turn k * forklifts + f of the
+# simulation, and a move is blocked by the forklifts before it as they are after their move of the same round and by
+# the ones after it as they were before theirs. With one forklift per cell a swap of cells can never happen, the
+# first of both forklifts finds the other one in its way.
+# Rows keep their turns while the simulation goes on, a forklift that replans or waits only rewrites its own row
+# from its next turn. Conflicts are looked for from the current round in windows of growing size.
+# The exit holds any number of forklifts and never blocks a move. Waits of space-time paths are never blocked.
+
+FIRST_WINDOW = 16
+
+
+class ReservationTable:
+
+    def __init__(self, grid: np.ndarray, exit_cell: Cell):
+        self.rows, self.columns = grid.shape
+        # Cells out of the grid get the extra last id, which is not walkable
+        self.outside = self.rows * self.columns
+        self.walkable = np.append(((grid == constants.EMPTY) | (grid == constants.EXIT)).ravel(), False)
+        self.exit_id = exit_cell.line * self.columns + exit_cell.column
+        self.cells = None
+        self.waits = None
+        # Turns of the plan of every forklift, it stays in its last cell after them
+        self.lengths = None
+        # Turns every forklift took
+        self.turns = None
+
+    def reserve(self, positions: [Cell], plans: [np.ndarray]) -> None:
+        # Plans are the move codes of every forklift from its first turn
+        num_forklifts = len(plans)
+        width = max(len(plan) for plan in plans) + 2
+        self.cells = np.empty((num_forklifts, width), dtype=np.intp)
+        self.waits = np.zeros((num_forklifts, width), dtype=bool)
+        self.lengths = np.zeros(num_forklifts, dtype=np.intp)
+        self.turns = np.zeros(num_forklifts, dtype=np.intp)
+        for forklift, (position, plan) in enumerate(zip(positions, plans)):
+            self.replan(forklift, 0, position, plan)
+
+    def replan(self, forklift: int, turn: int, position: Cell, plan: np.ndarray) -> None:
+        # The forklift is in position before its turn, from where it follows plan
+        length = len(plan)
+        end = turn + length
+        if end + 2 > self.cells.shape[1]:
+            self.grow(end + 2)
+
+        lines = position.line + np.cumsum(MOVE_LINES[plan])
+        columns = position.column + np.cumsum(MOVE_COLUMNS[plan])
+        inside = (lines >= 0) & (lines < self.rows) & (columns >= 0) & (columns < self.columns)
+        row = self.cells[forklift]
+        row[turn] = position.line * self.columns + position.column
+        row[turn + 1:end + 1] = np.where(inside, lines * self.columns + columns, self.outside)
+        row[end + 1:] = row[end]
+        self.waits[forklift, turn:end] = plan == WAIT
+        self.waits[forklift, end:] = False
+        self.lengths[forklift] = end
+        self.turns[forklift] = turn
+
+    def grow(self, width: int) -> None:
+        width = max(width, 2 * self.cells.shape[1])
+        num_forklifts, old_width = self.cells.shape
+        cells = np.empty((num_forklifts, width), dtype=np.intp)
+        cells[:, :old_width] = self.cells
+        cells[:, old_width:] = self.cells[:, -1:]
+        waits = np.zeros((num_forklifts, width), dtype=bool)
+        waits[:, :old_width] = self.waits
+        self.cells = cells
+        self.waits = waits
+
+    def find_first_conflict(self, active: np.ndarray, stuck: np.ndarray) -> tuple | None:
+        # (forklift, turn) of the first planned move of the active forklifts, in turn order, into a blocked cell.
+        # Stuck forklifts end the simulation at their next turn, that is a conflict too.
+        num_forklifts = len(self.turns)
+        forklifts = np.arange(num_forklifts)
+        first = None
+        if stuck.any():
+            first = min((int(self.turns[f]), int(f)) for f in forklifts[stuck])
+
+        # Forklift j is in cell [j, k + 1] at turn k of forklift i > j and in cell [j, k] at turn k of i < j
+        ahead = forklifts[None, :] < forklifts[:, None]
+        start = int(self.turns[active].min()) if active.any() else 0
+        end = int(self.lengths[active].max()) if active.any() else 0
+        if first is not None:
+            end = min(end, first[0] + 1)
+        window = FIRST_WINDOW
+        while start < end:
+            stop = min(start + window, end)
+            turns = np.arange(start, stop)
+            before = self.cells[:, start:stop]
+            targets = self.cells[:, start + 1:stop + 1]
+            occupants = np.where(ahead[:, :, None], targets[None, :, :], before[None, :, :])
+            occupied = occupants == targets[:, None, :]
+            occupied[forklifts, forklifts] = False
+
+            blocked = (occupied.any(axis=1) & (targets != self.exit_id)) | ~self.walkable[targets]
+            blocked &= (turns[None, :] >= self.turns[:, None]) & (turns[None, :] < self.lengths[:, None])
+            blocked &= active[:, None] & ~self.waits[:, start:stop]
+            if blocked.any():
+                # Turn major order is the turn order of the simulation
+                turn, forklift = np.unravel_index(np.argmax(blocked.T), (stop - start, num_forklifts))
+                conflict = (start + int(turn), int(forklift))
+                if first is None or conflict < first:
+                    first = conflict
+                break
+            start = stop
+            window *= 2
+
+        if first is None:
+            return None
+        return first[1], first[0]
+
+    def count_turns_before(self, conflict: tuple | None) -> np.ndarray:
+        # Turns every forklift takes before the conflict, counted from the turns it took, plans are followed up to
+        # there. Without a conflict every plan is followed to the turn after its end.
+        if conflict is None:
+            return self.lengths + 1 - self.turns
+        forklift, turn = conflict
+        forklifts = np.arange(len(self.turns))
+        return np.maximum(turn + (forklifts < forklift) - self.turns, 0)
+
+    def advance(self, turns: np.ndarray) -> None:
+        self.turns += turns
+
+    def get_occupied_cells(self, forklift: int) -> [frozenset]:
+        # (line, column) of the other forklifts before each of the next turns of forklift, which must take the next
+        # turn of the simulation. The last set holds for every later turn, the exit is left out.
+        others = np.delete(np.arange(len(self.turns)), forklift)
+        turn = int(self.turns[forklift])
+        ahead = (others < forklift).astype(np.intp)
+        end = max(int(self.lengths[others].max()) + 1 - turn, 1) if len(others) else 1
+        occupied = []
+        for offset in range(end):
+            columns = np.minimum(turn + offset + ahead, self.cells.shape[1] - 1)
+            cells = self.cells[others, columns]
+            cells = cells[(cells != self.exit_id) & (cells != self.outside)]
+            occupied.append(frozenset(zip((cells // self.columns).tolist(), (cells % self.columns).tolist())))
+        return occupied
+
+    def get_position(self, forklift: int) -> Cell:
+        # Cell of the forklift before its next turn
+        turn = min(int(self.turns[forklift]), int(self.lengths[forklift]))
+        line, column = divmod(int(self.cells[forklift, turn]), self.columns)
+        return Cell(line, column)
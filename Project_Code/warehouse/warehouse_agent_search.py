@@ -1,4 +1,5 @@
 from copy import copy
+from functools import partial
 from typing import TypeVar
 
 import numpy as np
@@ -6,10 +7,18 @@ import numpy as np
 import constants
 from agentsearch.agent import Agent
 from agentsearch.state import State
+from search_methods.astar_search import AStarSearch
+from warehouse.action_path import encode_actions
 from warehouse.cell import Cell
+from warehouse.distance_field import DistanceField
 from warehouse.heuristic_warehouse import HeuristicWarehouse
 from warehouse.pair import Pair
+from warehouse.pairs_pool import calculate_pairs_in_pool
+from warehouse.pairs_cache import get_map_fingerprint, get_pairs_cache_filename, load_pairs, save_pairs
 from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
+from warehouse.warehouse_search_state import WarehouseSearchState
+from warehouse.warehouse_timed_search_state import WarehouseTimedSearchState
+from warehouse.warehouse_state import WarehouseState
 
 
 class WarehouseAgentSearch(Agent):
@@ -23,6 +32,13 @@ class WarehouseAgentSearch(Agent):
         self.products = []
         self.exit = None
         self.pairs = []
+        # Blocked forklifts replan in space and time around the plans of the others, waiting if needed
+        self.space_time_replanning = False
+        # Paths of the replanning searches of the collision checks, None to always search
+        self.path_cache = None
+        # Replanning searches use the true distances to their targets as heuristic instead of Manhattan distances
+        self.target_distance_heuristic = False
+        self.target_distances = {}
         for i in range(environment.rows):
             for j in range(environment.columns):
                 if environment.matrix[i][j] == constants.FORKLIFT:
@@ -32,6 +48,10 @@ class WarehouseAgentSearch(Agent):
                 elif environment.matrix[i][j] == constants.PRODUCT:
                     self.products.append(Cell(i, j))
 
+        # Static grid shared by the search states, forklifts are tracked as obstacles
+        self.grid = np.where(environment.matrix == constants.FORKLIFT, constants.EMPTY, environment.matrix)
+        self.grid.flags.writeable = False
+
         for a in self.forklifts:
             for p in self.products:
                 self.pairs.append(Pair(a, p))
@@ -46,49 +66,166 @@ class WarehouseAgentSearch(Agent):
         for a in self.forklifts:
             self.pairs.append(Pair(a, self.exit))
 
+        # Dense ids: forklifts first, then products, then the exit
+        self.exit_id = len(self.forklifts) + len(self.products)
+        self.cells_ids = {}
+        for cell_id, cell in enumerate(self.forklifts + self.products + [self.exit]):
+            self.cells_ids[(cell.line, cell.column)] = cell_id
+
+        self.pairs_index = {}
+        for pair in self.pairs:
+            id1 = self.get_cell_id(pair.cell1)
+            id2 = self.get_cell_id(pair.cell2)
+            self.pairs_index[(id1, id2)] = (pair, True)
+            self.pairs_index[(id2, id1)] = (pair, False)
+
+        self.distances = np.full((self.exit_id + 1, self.exit_id + 1), 999, dtype=np.int32)
+
     def __str__(self) -> str:
         string = "Pairs:\n"
         for p in self.pairs:
             string += f"{p}\n"
         return string
 
-    def calculate_pairs_distances(self):
+    def calculate_pairs_distances(self, use_distance_fields: bool = False, workers: int | None = 1):
+        # workers: number of processes computing the pairs, None uses every CPU
+        state = self.build_pairs_state()
+        if workers != 1:
+            calculate_pairs_in_pool(self, state, use_distance_fields, workers)
+        elif use_distance_fields:
+            self.calculate_pairs_distances_from_fields(state)
+        else:
+            self.calculate_pairs_distances_with_search(state)
+        self.update_distances()
+
+    def calculate_pairs_distances_cached(self, problem_filename: str, use_distance_fields: bool = False,
+                                         workers: int | None = 1):
+        matrix = self.initial_environment.matrix
+        fingerprint = get_map_fingerprint(matrix)
+        cache_filename = get_pairs_cache_filename(problem_filename, matrix)
+        if load_pairs(self, cache_filename, fingerprint):
+            return
+
+        self.calculate_pairs_distances(use_distance_fields, workers)
+        if not self.has_been_stopped():
+            save_pairs(self, cache_filename, fingerprint)
+
+    def build_pairs_state(self) -> WarehouseState:
+        # Pair searches allow collisions
         state = copy(self.initial_environment)
         state.allow_collisions = True
+        return state
+
+    def get_pair_search_starts(self, state: WarehouseState) -> [(Cell, frozenset)]:
+        # Start cell and forklift obstacles of the search of every pair. Forklift cells still set in the matrix the
+        # searches used to share, the last forklift and every start cell are cleared as the pairs go by
+        starts = []
+        obstacles = frozenset((forklift.line, forklift.column) for forklift in self.forklifts[:-1])
         for pair in self.pairs:
-            pair_line = pair.cell1.line
-            pair_column = pair.cell1.column
-
-            if state.is_movable_cell(pair_line, pair_column):
-                state.update_forklift_in_matrix(pair_line, pair_column)
-            elif pair_column > 0 and state.is_movable_cell(pair_line, pair_column - 1):
-                state.update_forklift_in_matrix(pair_line, pair_column - 1)
-            elif pair_column < state.columns - 1 and state.is_movable_cell(pair_line, pair_column + 1):
-                state.update_forklift_in_matrix(pair_line, pair_column + 1)
-            else:
-                state.update_forklift_in_matrix(pair_line, pair_column)
-
-            problem = WarehouseProblemSearch(state, pair.cell2)
+            start = self.get_search_start(state, pair.cell1)
+            obstacles -= {(start.line, start.column)}
+            starts.append((start, obstacles))
+        return starts
+
+    def calculate_pairs_distances_with_search(self, state: WarehouseState):
+        for pair, (start, obstacles) in zip(self.pairs, self.get_pair_search_starts(state)):
+            search_state = self.build_search_state(start, True, obstacles)
+
+            problem = WarehouseProblemSearch(search_state, pair.cell2)
             solution = self.solve_problem(problem)
-            pair.actions = solution.actions
-            pair.invert_actions()
-            pair.value = solution.cost
+            pair.set_path(solution.cost, encode_actions(solution.actions))
+
+    def calculate_pairs_distances_from_fields(self, state: WarehouseState):
+        # One flood per source cell instead of one A* per pair
+        fields = {}
+        values = []
+        for pair, (start, _) in zip(self.pairs, self.get_pair_search_starts(state)):
+            field = fields.get(str(pair.cell1))
+            if field is None:
+                field = DistanceField(state, start)
+                fields[str(pair.cell1)] = field
+
+            goal = field.get_goal(pair.cell2, pair.cell2.is_cell(self.exit))
+            values.append(int(field.get_distance(goal)))
+        self.set_pairs_values(values)
+
+    def set_pairs_values(self, values: [int]) -> None:
+        # Floods only give the values, their paths break ties in another order than A*, so every path is searched
+        # the first time it is used
+        starts = self.get_pair_search_starts(self.build_pairs_state())
+        for pair, value, (start, obstacles) in zip(self.pairs, values, starts):
+            pair.set_value(value, partial(self.search_pair_path, start, obstacles))
+
+    def search_pair_path(self, start: Cell, obstacles: frozenset, pair: Pair) -> bytes:
+        # Same search as calculate_pairs_distances_with_search, the obstacles are part of the search states.
+        # Own search method and heuristic, GA runs in other threads share the pairs
+        problem = WarehouseProblemSearch(self.build_search_state(start, True, obstacles), pair.cell2)
+        heuristic = HeuristicWarehouse()
+        heuristic.problem = problem
+        problem.heuristic = heuristic
+        return encode_actions(AStarSearch().search(problem).actions)
+
+    def build_search_state(self, cell: Cell, allow_collisions: bool,
+                           obstacles: frozenset = frozenset()) -> WarehouseSearchState:
+        return WarehouseSearchState(self.grid, cell.line, cell.column, self.exit.line, self.exit.column,
+                                    allow_collisions, obstacles)
+
+    def build_timed_search_state(self, cell: Cell, occupied: [frozenset]) -> WarehouseTimedSearchState:
+        return WarehouseTimedSearchState(self.grid, cell.line, cell.column, self.exit.line, self.exit.column, occupied)
+
+    def get_goal_cells(self, target: Cell) -> [Cell]:
+        # Walkable cells where WarehouseProblemSearch.is_goal holds: the exit itself, products from either side
+        if target.is_cell(self.exit):
+            return [target]
+        return [Cell(target.line, column) for column in (target.column - 1, target.column + 1)
+                if 0 <= column < self.grid.shape[1] and self.grid[target.line][column] in (constants.EMPTY,
+                                                                                            constants.EXIT)]
+
+    def get_target_distances(self, target: Cell) -> [[float]]:
+        # Distance of every cell to the goal cells of target on the static grid, inf where they cannot be reached.
+        # One flood per goal cell the first time a target is asked for, every search towards it shares the result.
+        key = (target.line, target.column)
+        distances = self.target_distances.get(key)
+        if distances is None:
+            state = self.build_search_state(target, True)
+            nearest = np.full(self.grid.shape, np.inf)
+            for goal in self.get_goal_cells(target):
+                field = DistanceField(state, goal)
+                nearest = np.minimum(nearest, np.where(field.distances >= 0, field.distances, np.inf))
+            distances = self.target_distances[key] = nearest.tolist()
+        return distances
+
+    @staticmethod
+    def get_search_start(state: WarehouseState, cell: Cell) -> Cell:
+        # Products are not walkable, so the search starts next to them
+        if state.is_movable_cell(cell.line, cell.column):
+            return cell
+        if cell.column > 0 and state.is_movable_cell(cell.line, cell.column - 1):
+            return Cell(cell.line, cell.column - 1)
+        if cell.column < state.columns - 1 and state.is_movable_cell(cell.line, cell.column + 1):
+            return Cell(cell.line, cell.column + 1)
+        return cell
+
+    def update_distances(self):
+        for (id1, id2), (pair, _) in self.pairs_index.items():
+            self.distances[id1][id2] = pair.value
+
+    def get_cell_id(self, cell: Cell) -> int | None:
+        return self.cells_ids.get((cell.line, cell.column))
+
+    def get_pair_by_ids(self, id1: int, id2: int) -> (Pair | None, bool | None):
+        return self.pairs_index.get((id1, id2), (None, None))
 
     def get_pair(self, cell1: Cell, cell2: Cell) -> (Pair | None, bool | None):
-        for pair in self.pairs:
-            if pair.is_pair(cell1, cell2):
-                return pair, True
-            elif pair.is_pair(cell2, cell1):
-                return pair, False
-
-        return None, None
+        return self.get_pair_by_ids(self.get_cell_id(cell1), self.get_cell_id(cell2))
 
     def get_distance(self, cell1: Cell, cell2: Cell) -> int:
-        pair, _ = self.get_pair(cell1, cell2)
-        if pair:
-            return pair.value
+        id1 = self.get_cell_id(cell1)
+        id2 = self.get_cell_id(cell2)
+        if id1 is None or id2 is None:
+            return 999
 
-        return 999
+        return int(self.distances[id1][id2])
 
 
 def read_state_from_txt_file(filename: str):
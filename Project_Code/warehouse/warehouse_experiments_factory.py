@@ -3,6 +3,7 @@ from experiments.experiment_listener import ExperimentListener
 from experiments.experiments_factory import ExperimentsFactory
 from experiments_statistics.statistic_best_average import StatisticBestAverage
 from experiments_statistics.statistic_best_in_run import StatisticBestInRun
+from experiments_statistics.statistic_generations import StatisticGenerations
 from ga.genetic_algorithm import GeneticAlgorithm
 from ga.genetic_operators.mutation_insert import MutationInsert
 from ga.genetic_operators.mutation_psm import MutationPSM
@@ -10,8 +11,15 @@ from ga.genetic_operators.mutation_rsm import MutationRSM
 from ga.genetic_operators.recombination_cx import RecombinationCX
 from ga.genetic_operators.recombination_ox1 import RecombinationOX1
 from ga.genetic_operators.recombination_pmx import RecombinationPMX
+from ga.island_model import IslandModel, RING
 from ga.selection_methods.tournament import Tournament
+from ga.termination_criteria.evaluation_budget import EvaluationBudget
+from ga.termination_criteria.stagnation import Stagnation
+from ga.termination_criteria.target_fitness import TargetFitness
+from ga.termination_criteria.time_limit import TimeLimit
+from warehouse.path_cache import PathCache
 from warehouse.warehouse_agent_search import read_state_from_txt_file, WarehouseAgentSearch
+from warehouse.warehouse_local_search import WarehouseLocalSearch
 from warehouse.warehouse_problemforGA import WarehouseProblemGA
 from warehouse.warehouse_state import WarehouseState
 
@@ -25,6 +33,16 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
         self.selection_method = None
         self.recombination_method = None
         self.mutation_method = None
+        self.batch_evaluation = False
+        self.batch_operators = False
+        self.evaluation_workers = 1
+        self.fitness_cache_size = 0
+        self.islands = 1
+        self.migration_interval = 10
+        self.migrants = 1
+        self.migration_topology = RING
+        self.local_search = None
+        self.termination_criteria = []
         self.problem = None
         self.experiment = None
 
@@ -36,6 +54,62 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
             if allow_col in ('n', 'no', 'f', 'false', 'off', '0'):
                 self.allow_collisions = False
 
+        use_distance_fields = self.is_parameter_enabled('Distance_fields')
+        space_time_replanning = self.is_parameter_enabled('Space_time_replanning')
+        target_distance_heuristic = self.is_parameter_enabled('Target_distance_heuristic')
+        path_cache_size = 0
+        if self.contains_parameter('Path_cache_size'):
+            path_cache_size = int(self.get_parameter_value('Path_cache_size'))
+
+        pairs_workers = 1
+        if self.contains_parameter('Pairs_workers'):
+            workers = self.get_parameter_value('Pairs_workers').lower()
+            pairs_workers = None if workers == 'auto' else int(workers)
+
+        self.batch_evaluation = self.is_parameter_enabled('Batch_evaluation')
+        self.batch_operators = self.is_parameter_enabled('Batch_operators')
+
+        if self.contains_parameter('Evaluation_workers'):
+            workers = self.get_parameter_value('Evaluation_workers').lower()
+            self.evaluation_workers = None if workers == 'auto' else int(workers)
+
+        if self.contains_parameter('Fitness_cache_size'):
+            self.fitness_cache_size = int(self.get_parameter_value('Fitness_cache_size'))
+
+        # ISLANDS
+        if self.contains_parameter('Islands'):
+            self.islands = int(self.get_parameter_value('Islands'))
+        if self.contains_parameter('Migration_interval'):
+            self.migration_interval = int(self.get_parameter_value('Migration_interval'))
+        if self.contains_parameter('Migrants'):
+            self.migrants = int(self.get_parameter_value('Migrants'))
+        if self.contains_parameter('Migration_topology'):
+            self.migration_topology = self.get_parameter_value('Migration_topology').lower()
+
+        # LOCAL SEARCH
+        if self.contains_parameter('Local_search'):
+            trigger = self.get_parameter_value('Local_search').lower()
+            if trigger in ('best', 'sample'):
+                self.local_search = WarehouseLocalSearch(trigger)
+                if self.contains_parameter('Local_search_amount'):
+                    self.local_search.amount = float(self.get_parameter_value('Local_search_amount'))
+                if self.contains_parameter('Local_search_time'):
+                    time_budget = self.get_parameter_value('Local_search_time').lower()
+                    self.local_search.time_budget = None if time_budget == 'none' else float(time_budget)
+                if self.contains_parameter('Local_search_interval'):
+                    self.local_search.interval = int(self.get_parameter_value('Local_search_interval'))
+
+        # TERMINATION, besides Max_generations
+        self.termination_criteria = []
+        if self.contains_parameter('Stagnation_generations'):
+            self.termination_criteria.append(Stagnation(int(self.get_parameter_value('Stagnation_generations'))))
+        if self.contains_parameter('Time_limit'):
+            self.termination_criteria.append(TimeLimit(float(self.get_parameter_value('Time_limit'))))
+        if self.contains_parameter('Max_evaluations'):
+            self.termination_criteria.append(EvaluationBudget(int(self.get_parameter_value('Max_evaluations'))))
+        if self.contains_parameter('Target_fitness'):
+            self.termination_criteria.append(TargetFitness(float(self.get_parameter_value('Target_fitness'))))
+
         self.population_size = int(self.get_parameter_value('Population_size'))
         self.max_generations = int(self.get_parameter_value('Max_generations'))
 
@@ -66,11 +140,16 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
                 self.mutation_method = MutationPSM(mutation_probability)
 
         # PROBLEM
-        matrix, num_rows, num_columns = read_state_from_txt_file(self.get_parameter_value("Problem_file"))
+        problem_file = self.get_parameter_value("Problem_file")
+        matrix, num_rows, num_columns = read_state_from_txt_file(problem_file)
 
         agent_search = WarehouseAgentSearch(
             WarehouseState(matrix, num_rows, num_columns, allow_collisions=self.allow_collisions))
-        agent_search.calculate_pairs_distances()
+        agent_search.calculate_pairs_distances_cached(problem_file, use_distance_fields, pairs_workers)
+        agent_search.space_time_replanning = space_time_replanning
+        agent_search.target_distance_heuristic = target_distance_heuristic
+        if path_cache_size > 0:
+            agent_search.path_cache = PathCache(path_cache_size)
 
         self.problem = WarehouseProblemGA(agent_search)
 
@@ -95,14 +174,34 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
         return self.experiment
 
     def generate_ga_instance(self, seed: int) -> GeneticAlgorithm:
-        ga = GeneticAlgorithm(
-            seed,
-            self.population_size,
-            self.max_generations,
-            self.selection_method,
-            self.recombination_method,
-            self.mutation_method
-        )
+        if self.islands > 1:
+            ga = IslandModel(
+                seed,
+                self.population_size,
+                self.max_generations,
+                self.selection_method,
+                self.recombination_method,
+                self.mutation_method,
+                self.islands
+            )
+            ga.migration_interval = self.migration_interval
+            ga.migrants = self.migrants
+            ga.topology = self.migration_topology
+        else:
+            ga = GeneticAlgorithm(
+                seed,
+                self.population_size,
+                self.max_generations,
+                self.selection_method,
+                self.recombination_method,
+                self.mutation_method
+            )
+        ga.batch_evaluation = self.batch_evaluation
+        ga.batch_operators = self.batch_operators
+        ga.evaluation_workers = self.evaluation_workers
+        ga.fitness_cache_size = self.fitness_cache_size
+        ga.local_search = self.local_search
+        ga.termination_criteria = self.termination_criteria
 
         for statistic in self.statistics:
             ga.add_listener(statistic)
@@ -114,6 +213,8 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
             return StatisticBestInRun(experiment_header)
         if statistic_name == 'BestAverage':
             return StatisticBestAverage(self.num_runs, experiment_header)
+        if statistic_name == 'Generations':
+            return StatisticGenerations(experiment_header)
 
     def build_experiment_textual_representation(self) -> str:
         string = 'Population size: ' + str(self.population_size) + '\r\n'
@@ -122,6 +223,19 @@ class WarehouseExperimentsFactory(ExperimentsFactory):
         string += 'Recombination: ' + str(self.recombination_method) + '\r\n'
         string += 'Mutation: ' + str(self.mutation_method) + '\r\n'
         string += 'Allow Collisions: ' + str(self.allow_collisions) + '\r\n'
+        if self.problem.agent_search.space_time_replanning:
+            string += 'Space-time replanning: True' + '\r\n'
+        if self.problem.agent_search.target_distance_heuristic:
+            string += 'Target distance heuristic: True' + '\r\n'
+        if self.problem.agent_search.path_cache is not None:
+            string += 'Path cache size: ' + str(self.problem.agent_search.path_cache.max_size) + '\r\n'
+        if self.islands > 1:
+            string += 'Islands: ' + str(self.islands) + ' (' + self.migration_topology + ', ' + str(self.migrants) + \
+                      ' every ' + str(self.migration_interval) + ' generations)' + '\r\n'
+        if self.local_search is not None:
+            string += 'Local search: ' + str(self.local_search) + '\r\n'
+        if self.termination_criteria:
+            string += 'Termination: ' + ', '.join(str(criterion) for criterion in self.termination_criteria) + '\r\n'
         return string
 
     def build_experiment_header(self) -> str:
@@ -1,71 +1,168 @@
 from copy import copy
+from random import Random
 
+import numpy as np
+
+import constants
 from agentsearch.action import Action
-from ga.genetic_algorithm import GeneticAlgorithm
 from ga.individual_int_vector import IntVectorIndividual
+from search_methods.astar_search import AStarSearch
+from search_methods.solution import Solution
+from warehouse.action_path import ACTION_COSTS, ACTIONS, MOVE_CODES, MOVE_COLUMNS, MOVE_LINES, ActionPath, \
+    encode_actions
 from warehouse.actions import ActionNoMove
 from warehouse.cell import Cell
 from warehouse.dynamic_forklift import DynamicForklift
+from warehouse.heuristic_target_distances import HeuristicTargetDistances
+from warehouse.heuristic_warehouse import HeuristicWarehouse
+from warehouse.reservation_table import ReservationTable
 from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
 from warehouse.warehouse_state import WarehouseState
+from warehouse.warehouse_timed_problem_search import WarehouseTimedProblemSearch
 
 
 class WarehouseIndividual(IntVectorIndividual):
+    __slots__ = ('agent', '_forklifts_actions')
+
     # noinspection PyUnresolvedReferences
-    def __init__(self, problem: "WarehouseProblem", num_genes: int, initialize_genome: bool = True):
+    def __init__(self, problem: "WarehouseProblem", num_genes: int, rand: Random = None):
         super().__init__(problem, num_genes)
         self.agent = self.problem.agent_search
-        self.forklifts_actions = []
+        self._forklifts_actions = []
 
-        if not initialize_genome:
+        # Without a generator the genome is set by the caller
+        if rand is None:
             return
 
+        genome = [-1] * num_genes
         for i in range(self.num_genes):
-            new_gene = GeneticAlgorithm.rand.randint(0, num_genes - 1)
-            while new_gene in self.genome:
-                new_gene = GeneticAlgorithm.rand.randint(0, num_genes - 1)
-            self.genome[i] = new_gene
+            new_gene = rand.randint(0, num_genes - 1)
+            while new_gene in genome:
+                new_gene = rand.randint(0, num_genes - 1)
+            genome[i] = new_gene
+        self.genome = genome
+
+    @property
+    def forklifts_actions(self) -> [[Action]]:
+        # Without collision checks the fitness only needs pair costs, the actions are built when asked for
+        if self._forklifts_actions is None:
+            self._forklifts_actions = self.build_forklifts_actions()
+        return self._forklifts_actions
+
+    @forklifts_actions.setter
+    def forklifts_actions(self, forklifts_actions: list | None):
+        self._forklifts_actions = forklifts_actions
 
     def compute_fitness(self) -> float:
-        self.forklifts_actions = [[] for _ in range(len(self.agent.forklifts))]
         if self.agent.initial_environment.allow_collisions:
+            self.forklifts_actions = None
             self.fitness = self.compute_fitness_collision()
             return self.fitness
 
+        self.forklifts_actions = [[] for _ in range(len(self.agent.forklifts))]
         self.fitness = self.compute_fitness_with_collision_check()
         return self.fitness
 
-    def compute_fitness_collision(self) -> float:
-        fitness = 0
-
-        forklifts = self.agent.forklifts
-        forklift_index = 0
-        forklift_pos = forklifts[forklift_index]
+    def set_fitness(self, fitness: float) -> None:
+        # The actions were not kept, they are rebuilt when asked for
+        self.fitness = fitness
+        self.forklifts_actions = None
 
-        products = self.agent.products
-        products_size = len(products)
-
-        def get_fitness(origin_cell: Cell, target_cell: Cell):
-            p, normal_order = self.agent.get_pair(origin_cell, target_cell)
-            self.forklifts_actions[forklift_index].extend(p.actions if normal_order else p.actions_reversed)
-            return p.value
+    def get_route_legs(self):
+        # (forklift index, origin id, target id) of every trip, forklift ids are their indexes and product ids follow
+        forklifts_size = len(self.agent.forklifts)
+        products_size = len(self.agent.products)
+        exit_id = self.agent.exit_id
 
-        for g in range(self.num_genes):
-            gene = self.genome[g]
+        forklift_index = position_id = 0
+        for gene in self.genome:
             if gene < products_size:
-                product = products[gene]
-                fitness += get_fitness(forklift_pos, product)
-                forklift_pos = product
+                product_id = forklifts_size + gene
+                yield forklift_index, position_id, product_id
+                position_id = product_id
                 continue
 
-            fitness += get_fitness(forklift_pos, self.agent.exit)
-            forklift_index = gene - products_size + 1
-            forklift_pos = forklifts[forklift_index]
+            yield forklift_index, position_id, exit_id
+            forklift_index = position_id = gene - products_size + 1
 
-        fitness += get_fitness(forklift_pos, self.agent.exit)
-        return fitness
+        yield forklift_index, position_id, exit_id
 
-    def compute_fitness_with_collision_check(self) -> float:
+    def compute_fitness_collision(self) -> float:
+        distances = self.agent.distances
+        fitness = 0
+        for _, origin_id, target_id in self.get_route_legs():
+            fitness += distances[origin_id][target_id]
+        return int(fitness)
+
+    def get_leg_cost(self, previous_gene: int | None, gene: int | None) -> int:
+        # Cost of the trip that ends with gene, the previous gene tells where it starts (None is the first forklift)
+        # A separator or None as gene ends the trip at the exit
+        forklifts_size = len(self.agent.forklifts)
+        products_size = len(self.agent.products)
+        if previous_gene is None:
+            origin_id = 0
+        elif previous_gene < products_size:
+            origin_id = forklifts_size + previous_gene
+        else:
+            origin_id = previous_gene - products_size + 1
+
+        target_id = forklifts_size + gene if gene is not None and gene < products_size else self.agent.exit_id
+        return int(self.agent.distances[origin_id][target_id])
+
+    def get_genes_cost(self, indexes: set) -> int:
+        # Cost of the trips ending at the given genes, num_genes is the last trip to the exit
+        cost = 0
+        for index in indexes:
+            previous_gene = self.genome[index - 1] if index > 0 else None
+            gene = self.genome[index] if index < self.num_genes else None
+            cost += self.get_leg_cost(previous_gene, gene)
+        return cost
+
+    def can_update_fitness(self) -> bool:
+        return not self.dirty and self.agent.initial_environment.allow_collisions
+
+    def genes_swapped(self, index1: int, index2: int) -> None:
+        if not self.can_update_fitness():
+            self.dirty = True
+            return
+
+        # Only the trips into and out of both genes change
+        indexes = {index1, index1 + 1, index2, index2 + 1}
+        new_cost = self.get_genes_cost(indexes)
+        self.genome[index1], self.genome[index2] = self.genome[index2], self.genome[index1]
+        old_cost = self.get_genes_cost(indexes)
+        self.genome[index1], self.genome[index2] = self.genome[index2], self.genome[index1]
+        self.set_fitness(self.fitness + new_cost - old_cost)
+
+    def segment_reversed(self, start: int, end: int) -> None:
+        # Pair costs are symmetric, so a reversed run of products keeps its inner cost and only the two trips at the
+        # ends change. A separator inside would hand products to other forklifts, that needs a full evaluation.
+        products_size = len(self.agent.products)
+        if not self.can_update_fitness() or any(gene >= products_size for gene in self.genome[start:end + 1]):
+            self.dirty = True
+            return
+
+        before = self.genome[start - 1] if start > 0 else None
+        after = self.genome[end + 1] if end + 1 < self.num_genes else None
+        first, last = self.genome[start], self.genome[end]
+        new_cost = self.get_leg_cost(before, first) + self.get_leg_cost(last, after)
+        old_cost = self.get_leg_cost(before, last) + self.get_leg_cost(first, after)
+        self.set_fitness(self.fitness + new_cost - old_cost)
+
+    def build_forklifts_actions(self) -> [[Action]]:
+        if not self.agent.initial_environment.allow_collisions:
+            # Replays the simulation, for fitness computed in a batch or another process
+            self._forklifts_actions = [[] for _ in range(len(self.agent.forklifts))]
+            self.compute_fitness_with_collision_check()
+            return self._forklifts_actions
+
+        forklifts_actions = [[] for _ in range(len(self.agent.forklifts))]
+        for forklift_index, origin_id, target_id in self.get_route_legs():
+            pair, normal_order = self.agent.get_pair_by_ids(origin_id, target_id)
+            forklifts_actions[forklift_index].extend(pair.actions if normal_order else pair.actions_reversed)
+        return forklifts_actions
+
+    def build_forklifts_data(self) -> [DynamicForklift]:
         forklifts = self.agent.forklifts
         forklifts_len = len(forklifts)
         forklift_index = 0
@@ -96,8 +193,15 @@ class WarehouseIndividual(IntVectorIndividual):
 
         append_target(forklifts_data[forklift_index], self.agent.exit)
         forklifts_data[forklift_index].current_position = copy(forklifts[forklift_index])
+        return forklifts_data
 
-        # Simulation
+    def compute_fitness_with_collision_check(self) -> float:
+        # One move per turn on a copy of the state matrix
+        if self.agent.space_time_replanning:
+            return self.compute_fitness_with_space_time_replanning()
+
+        forklifts_data = self.build_forklifts_data()
+        forklifts_len = len(forklifts_data)
 
         fitness = 0
         forklift_index = 0
@@ -126,8 +230,12 @@ class WarehouseIndividual(IntVectorIndividual):
             state.column_forklift = forklift_data.current_position.column
 
             if not action.is_valid(state):
-                state_copy = copy(state)
-                new_path = self.search_alternative_path(forklift_data, state_copy)
+                # The other forklifts block the way, the searching one is only its own position
+                position = forklift_data.current_position
+                forklift_cells = np.argwhere(state.matrix == constants.FORKLIFT)
+                obstacles = {(int(line), int(column)) for line, column in forklift_cells}
+                obstacles.discard((position.line, position.column))
+                new_path = self.search_alternative_path(forklift_data, frozenset(obstacles))
                 if new_path:
                     action = self.get_next_simulation_action(forklift_data)
                     if action is None:
@@ -156,6 +264,77 @@ class WarehouseIndividual(IntVectorIndividual):
 
         return fitness
 
+    def compute_fitness_with_space_time_replanning(self) -> float:
+        # Forklifts follow their plans until the reservation table finds the first blocked move, all turns up to it
+        # are taken at once. The blocked forklift replans in space and time around the plans of the others, then
+        # only its row of the table changes
+        forklifts_data = self.build_forklifts_data()
+        table = ReservationTable(self.agent.grid, self.agent.exit)
+        plans = [forklift_data.get_remaining_codes() for forklift_data in forklifts_data]
+        table.reserve([forklift_data.current_position for forklift_data in forklifts_data], plans)
+
+        fitness = 0
+        while any(not forklift_data.in_exit for forklift_data in forklifts_data):
+            active = np.array([not forklift_data.in_exit for forklift_data in forklifts_data])
+            conflict = table.find_first_conflict(
+                active, np.array([forklift_data.move_tries > 3 for forklift_data in forklifts_data]) & active)
+
+            turns = table.count_turns_before(conflict)
+            for i, forklift_data in enumerate(forklifts_data):
+                if forklift_data.in_exit:
+                    turns[i] = 0
+                    continue
+                length = len(plans[i])
+                moves = min(int(turns[i]), length)
+                if moves > 0:
+                    fitness += int(ACTION_COSTS[plans[i][:moves]].sum())
+                    self.forklifts_actions[i].extend(ACTIONS[code] for code in plans[i][:moves])
+                    forklift_data.skip_actions(moves)
+                    forklift_data.move_tries = 0
+                    plans[i] = plans[i][moves:]
+                # The turn after the last action finds no action left
+                if turns[i] > length:
+                    forklift_data.in_exit = True
+            table.advance(turns)
+            for i, forklift_data in enumerate(forklifts_data):
+                if turns[i] > 0:
+                    forklift_data.current_position = table.get_position(i)
+
+            if conflict is None:
+                break
+
+            forklift_index, turn = conflict
+            forklift_data = forklifts_data[forklift_index]
+            if forklift_data.move_tries > 3:
+                fitness += 999
+                break
+
+            # Same turn as in compute_fitness_with_collision_check, for a move the table found blocked
+            self.get_next_simulation_action(forklift_data)
+            if self.search_space_time_path(forklift_data, table.get_occupied_cells(forklift_index)):
+                action = self.get_next_simulation_action(forklift_data)
+                if action is None:
+                    forklift_data.in_exit = True
+                    plans[forklift_index] = plans[forklift_index][:0]
+                    table.replan(forklift_index, turn + 1, forklift_data.current_position, plans[forklift_index])
+                    continue
+                forklift_data.move_tries = 0
+            else:
+                action = ActionNoMove()
+                forklift_data.move_tries += 1
+
+            fitness += action.cost
+            self.forklifts_actions[forklift_index].append(action)
+            code = MOVE_CODES[type(action)]
+            forklift_data.current_position = Cell(forklift_data.current_position.line + int(MOVE_LINES[code]),
+                                                  forklift_data.current_position.column + int(MOVE_COLUMNS[code]))
+            forklift_data.next_action()
+            plans[forklift_index] = forklift_data.get_remaining_codes()
+            # Only the row of this forklift changes, from its next turn
+            table.replan(forklift_index, turn + 1, forklift_data.current_position, plans[forklift_index])
+
+        return fitness
+
     @staticmethod
     def get_next_simulation_action(forklift_data: DynamicForklift) -> Action | None:
         action = forklift_data.get_action()
@@ -165,21 +344,59 @@ class WarehouseIndividual(IntVectorIndividual):
             action = forklift_data.get_action()
         return action
 
-    def search_alternative_path(self, forklift_data: DynamicForklift, state: WarehouseState) -> bool:
-        state.line_forklift = forklift_data.current_position.line
-        state.column_forklift = forklift_data.current_position.column
-
+    def search_alternative_path(self, forklift_data: DynamicForklift, obstacles: frozenset) -> bool:
+        # Obstacles are the cells of the other forklifts
+        position = forklift_data.current_position
         target = forklift_data.get_target()
-        problem = WarehouseProblemSearch(state, target)
-        solution = self.agent.solve_problem(problem)
 
-        if solution:
-            forklift_data.update_target(solution.actions)
+        def search() -> (bytes | None, frozenset):
+            search_state = self.agent.build_search_state(position, False, obstacles)
+            search_method = AStarSearch()
+            solution = self.solve_search_problem(WarehouseProblemSearch(search_state, target), search_method)
+            path = encode_actions(solution.actions) if solution else None
+            return path, self.get_looked_at_cells(search_method.get_explored_states())
+
+        path_cache = self.agent.path_cache
+        if path_cache is None:
+            path, _ = search()
+            return self.follow_path(forklift_data, path)
+        key = (position.line, position.column, target.line, target.column)
+        return self.follow_path(forklift_data, path_cache.get(key, obstacles, search))
+
+    @staticmethod
+    def get_looked_at_cells(explored: set) -> frozenset:
+        # Cells a search checked for obstacles, the neighbours of the states it expanded
+        cells = set()
+        for state in explored:
+            line, column = state.line_forklift, state.column_forklift
+            cells.update(((line + 1, column), (line - 1, column), (line, column + 1), (line, column - 1)))
+        return frozenset(cells)
+
+    def search_space_time_path(self, forklift_data: DynamicForklift, occupied: [frozenset]) -> bool:
+        # occupied are the cells of the other forklifts before each turn of this one, see ReservationTable
+        search_state = self.agent.build_timed_search_state(forklift_data.current_position, occupied)
+        solution = self.solve_search_problem(WarehouseTimedProblemSearch(search_state, forklift_data.get_target()))
+        return self.follow_path(forklift_data, encode_actions(solution.actions) if solution else None)
+
+    @staticmethod
+    def follow_path(forklift_data: DynamicForklift, path: bytes | None) -> bool:
+        if path is not None:
+            forklift_data.update_target(ActionPath(path))
             return True
 
         forklift_data.move_tries += 1
         return False
 
+    def solve_search_problem(self, problem: WarehouseProblemSearch, search_method: AStarSearch = None) -> Solution:
+        # Own search method and heuristic, the agent ones hold per search state and GA runs in other threads share it
+        if self.agent.target_distance_heuristic:
+            heuristic = HeuristicTargetDistances(self.agent)
+        else:
+            heuristic = HeuristicWarehouse()
+        heuristic.problem = problem
+        problem.heuristic = heuristic
+        return (search_method or AStarSearch()).search(problem)
+
     def obtain_all_path(self):
         forklifts = self.agent.forklifts
         forklifts_path = [[forklift] for forklift in forklifts]
@@ -226,8 +443,14 @@ class WarehouseIndividual(IntVectorIndividual):
         return True if self.fitness < other.fitness else False
 
     def __copy__(self):
-        new_instance = self.__class__(self.problem, self.num_genes, False)
-        new_instance.genome = self.genome.copy()
+        # Copy on write: the genome is shared until changed in place and forklifts_actions are only ever replaced
+        new_instance = self.__class__.__new__(self.__class__)
+        new_instance.num_genes = self.num_genes
+        new_instance.problem = self.problem
+        new_instance._genome = self._genome
         new_instance.fitness = self.fitness
-        new_instance.forklifts_actions = self.forklifts_actions.copy()
+        new_instance.dirty = self.dirty
+        self.genome_shared = new_instance.genome_shared = True
+        new_instance.agent = self.agent
+        new_instance._forklifts_actions = self._forklifts_actions
         return new_instance
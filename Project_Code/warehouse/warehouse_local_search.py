@@ -0,0 +1,127 @@
+import time
+
+from ga.local_search import LocalSearch, BEST
+from warehouse.warehouse_individual import WarehouseIndividual
+
+# Local search on the collision free route cost, every move is priced from the leg cost table in O(1):
+# - 2-opt reverses a run of products of one forklift, only the two legs at its ends change (pair costs are symmetric)
+# - Or-opt moves a chain of up to MAX_CHAIN products, possibly reversed, to any other place in the genome.
+#   Places past a separator hand the chain to another forklift, which covers relocate moves across routes.
+# First improvement, passes are repeated until no move improves or the deadline is reached.
+# With collision checks the improved genome is simulated again and only kept if its fitness, penalties
+# included, is better.
+
+MAX_CHAIN = 3
+
+
+class WarehouseLocalSearch(LocalSearch):
+
+    def __init__(self, trigger: str = BEST, amount: float = 1, time_budget: float | None = None, interval: int = 1):
+        super().__init__(trigger, amount, time_budget, interval)
+
+    def improve(self, individual: WarehouseIndividual, deadline: float | None) -> float:
+        costs = individual.problem.get_leg_costs()
+        products_size = len(individual.agent.products)
+        genome = list(individual.genome)
+        start = end = len(genome)
+
+        gain = 0
+        improved = True
+        while improved and (deadline is None or time.perf_counter() < deadline):
+            improved = False
+            for move in (self.two_opt, self.or_opt):
+                move_gain = move(genome, costs, products_size, start, end, deadline)
+                if move_gain > 0:
+                    gain += move_gain
+                    improved = True
+
+        if gain == 0:
+            return 0
+
+        if individual.agent.initial_environment.allow_collisions:
+            individual.genome = genome
+            individual.set_fitness(individual.compute_fitness_collision())
+            individual.dirty = False
+            self.evaluations += 1
+            return gain
+
+        # The route cost only guides the search, collision penalties can hide its gain or turn it into a loss
+        fitness = individual.fitness
+        old_genome = individual.genome
+        individual.genome = genome
+        new_fitness = individual.compute_fitness()
+        individual.dirty = False
+        self.evaluations += 1
+        if new_fitness >= fitness:
+            individual.genome = old_genome
+            individual.set_fitness(fitness)
+            return 0
+        return fitness - new_fitness
+
+    @staticmethod
+    def two_opt(genome: list, costs: list, products_size: int, start: int, end: int, deadline: float | None) -> int:
+        gain = 0
+        num_genes = len(genome)
+        for i in range(num_genes):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if genome[i] >= products_size:
+                continue
+
+            before = genome[i - 1] if i > 0 else start
+            for j in range(i + 1, num_genes):
+                if genome[j] >= products_size:
+                    break
+
+                after = genome[j + 1] if j + 1 < num_genes else end
+                delta = costs[before][genome[j]] + costs[genome[i]][after] - \
+                    costs[before][genome[i]] - costs[genome[j]][after]
+                if delta < 0:
+                    genome[i:j + 1] = genome[i:j + 1][::-1]
+                    gain -= delta
+        return gain
+
+    @staticmethod
+    def or_opt(genome: list, costs: list, products_size: int, start: int, end: int, deadline: float | None) -> int:
+        gain = 0
+        num_genes = len(genome)
+        for length in range(1, MAX_CHAIN + 1):
+            i = 0
+            while i + length <= num_genes:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return gain
+                chain = genome[i:i + length]
+                if any(gene >= products_size for gene in chain):
+                    i += 1
+                    continue
+
+                first, last = chain[0], chain[-1]
+                before = genome[i - 1] if i > 0 else start
+                after = genome[i + length] if i + length < num_genes else end
+                removal_gain = costs[before][first] + costs[last][after] - costs[before][after]
+
+                # Genome without the chain, the chain goes between rest[t - 1] and rest[t]
+                rest = genome[:i] + genome[i + length:]
+                best_delta, best_place, best_reversed = 0, None, False
+                for t in range(len(rest) + 1):
+                    if t == i:
+                        continue
+
+                    previous = rest[t - 1] if t > 0 else start
+                    following = rest[t] if t < len(rest) else end
+                    delta = costs[previous][first] + costs[last][following] - costs[previous][following] - \
+                        removal_gain
+                    if delta < best_delta:
+                        best_delta, best_place, best_reversed = delta, t, False
+                    delta = costs[previous][last] + costs[first][following] - costs[previous][following] - \
+                        removal_gain
+                    if delta < best_delta:
+                        best_delta, best_place, best_reversed = delta, t, True
+
+                if best_place is None:
+                    i += 1
+                    continue
+
+                genome[:] = rest[:best_place] + (chain[::-1] if best_reversed else chain) + rest[best_place:]
+                gain -= best_delta
+        return gain
@@ -1,3 +1,8 @@
+from random import Random
+
+import numpy as np
+
+from ga.fitness_cache import FitnessCache
 from ga.problem import Problem
 from warehouse.warehouse_agent_search import WarehouseAgentSearch
 from warehouse.warehouse_individual import WarehouseIndividual
@@ -8,9 +13,83 @@ class WarehouseProblemGA(Problem):
         self.forklifts = agent_search.forklifts
         self.products = agent_search.products
         self.agent_search = agent_search
+        self.fitness_caches = {}
+        self.leg_costs = None
+
+    def generate_individual(self, rand: Random) -> "WarehouseIndividual":
+        return WarehouseIndividual(self, len(self.agent_search.products) + len(self.forklifts) - 1, rand)
+
+    def get_leg_costs(self) -> [[int]]:
+        # Cost of the trip from after gene a to gene b, same legs as WarehouseIndividual.get_leg_cost.
+        # Index num_genes stands for the start of the first forklift as a and for the final trip to the exit as b.
+        if self.leg_costs is None:
+            forklifts_size = len(self.forklifts)
+            products_size = len(self.products)
+            exit_id = self.agent_search.exit_id
+            genes = np.arange(products_size + forklifts_size - 1)
+            origins = np.append(np.where(genes < products_size, forklifts_size + genes, genes - products_size + 1), 0)
+            targets = np.append(np.where(genes < products_size, forklifts_size + genes, exit_id), exit_id)
+            self.leg_costs = self.agent_search.distances[np.ix_(origins, targets)].tolist()
+        return self.leg_costs
+
+    def build_individual(self, genome) -> WarehouseIndividual:
+        ind = WarehouseIndividual(self, len(genome))
+        ind.genome = genome
+        return ind
+
+    def evaluate_individuals(self, individuals: list) -> None:
+        if not self.agent_search.initial_environment.allow_collisions:
+            super().evaluate_individuals(individuals)
+            return
+
+        genomes = np.array([ind.genome for ind in individuals], dtype=np.int32)
+        for ind, fitness in zip(individuals, self.compute_genomes_fitness(genomes).tolist()):
+            ind.set_fitness(fitness)
+
+    def get_fitness_settings(self) -> tuple:
+        # Settings the fitness of a genome depends on. The replanning of the collision checks changes the paths the
+        # blocked forklifts take, the heuristic too when paths of the same cost tie
+        agent_search = self.agent_search
+        if agent_search.initial_environment.allow_collisions:
+            return True,
+        return False, agent_search.space_time_replanning, agent_search.target_distance_heuristic
+
+    def get_fitness_cache(self, max_size: int) -> FitnessCache:
+        # Each setting keeps its own cache, the settings can change between runs of the same problem
+        settings = self.get_fitness_settings()
+        cache = self.fitness_caches.get(settings)
+        if cache is None:
+            cache = self.fitness_caches[settings] = FitnessCache(max_size)
+        cache.max_size = max_size
+        return cache
+
+    def evaluate_genomes(self, genomes: list) -> list:
+        if self.agent_search.initial_environment.allow_collisions:
+            return self.compute_genomes_fitness(np.array(genomes, dtype=np.int32)).tolist()
+
+        ind = self.build_individual(genomes[0])
+        fitness_values = []
+        for genome in genomes:
+            ind.genome = genome
+            fitness_values.append(ind.compute_fitness())
+        return fitness_values
+
+    def compute_genomes_fitness(self, genomes: np.ndarray) -> np.ndarray:
+        # Collision free fitness of every row of genomes, same routes as WarehouseIndividual.get_route_legs
+        forklifts_size = len(self.forklifts)
+        products_size = len(self.products)
+        exit_id = self.agent_search.exit_id
+        distances = self.agent_search.distances
+
+        is_product = genomes < products_size
+        # Node reached after each gene: the product, or the next forklift start after a separator
+        positions = np.where(is_product, forklifts_size + genomes, genomes - products_size + 1)
+        targets = np.where(is_product, positions, exit_id)
+        origins = np.empty_like(positions)
+        origins[:, 0] = 0
+        origins[:, 1:] = positions[:, :-1]
 
-    def generate_individual(self) -> "WarehouseIndividual":
-        return WarehouseIndividual(self, len(self.agent_search.products) + len(self.forklifts) - 1)
+        return distances[origins, targets].sum(axis=1, dtype=np.int64) + distances[positions[:, -1], exit_id]
 
     def __str__(self):
         string = "# of forklifts: "
@@ -0,0 +1,90 @@
+from numpy import ndarray
+
+import constants
+from agentsearch.action import Action
+from agentsearch.state import State
+
+
+class WarehouseSearchState(State[Action]):
+    # Search state that only stores the forklift position.
+    # The grid is shared (read only) by every state of a search, dynamic obstacles
+    # like other forklifts go in a small set of (line, column) positions.
+
+    def __init__(self, grid: ndarray, line_forklift: int, column_forklift: int, line_exit: int, column_exit: int,
+                 allow_collisions: bool = True, obstacles: frozenset = frozenset()):
+        super().__init__()
+        self.grid = grid
+        self.rows, self.columns = grid.shape
+        self.line_forklift = line_forklift
+        self.column_forklift = column_forklift
+        self.line_exit = line_exit
+        self.column_exit = column_exit
+        self.allow_collisions = allow_collisions
+        self.obstacles = obstacles
+
+    def is_movable_cell(self, line: int, column: int) -> bool:
+        if (line, column) in self.obstacles:
+            return self.allow_collisions
+
+        cell = self.grid[line][column]
+        return cell == constants.EMPTY or cell == constants.EXIT or self.allow_collisions and cell == constants.FORKLIFT
+
+    def can_move_up(self) -> bool:
+        if self.line_forklift <= 0:
+            return False
+
+        return self.is_movable_cell(self.line_forklift - 1, self.column_forklift)
+
+    def can_move_right(self) -> bool:
+        if self.column_forklift >= self.columns - 1:
+            return False
+
+        return self.is_movable_cell(self.line_forklift, self.column_forklift + 1)
+
+    def can_move_down(self) -> bool:
+        if self.line_forklift >= self.rows - 1:
+            return False
+
+        return self.is_movable_cell(self.line_forklift + 1, self.column_forklift)
+
+    def can_move_left(self) -> bool:
+        if self.column_forklift <= 0:
+            return False
+
+        return self.is_movable_cell(self.line_forklift, self.column_forklift - 1)
+
+    def update_forklift_position(self, new_line: int, new_column: int):
+        self.line_forklift = new_line
+        self.column_forklift = new_column
+        # Same as WarehouseState.update_forklift_in_matrix, a cell driven over is empty once the forklift leaves it
+        if (new_line, new_column) in self.obstacles:
+            self.obstacles = self.obstacles - {(new_line, new_column)}
+
+    def move_up(self) -> None:
+        self.update_forklift_position(self.line_forklift - 1, self.column_forklift)
+
+    def move_right(self) -> None:
+        self.update_forklift_position(self.line_forklift, self.column_forklift + 1)
+
+    def move_down(self) -> None:
+        self.update_forklift_position(self.line_forklift + 1, self.column_forklift)
+
+    def move_left(self) -> None:
+        self.update_forklift_position(self.line_forklift, self.column_forklift - 1)
+
+    def __copy__(self) -> "WarehouseSearchState":
+        return self.__class__(self.grid, self.line_forklift, self.column_forklift, self.line_exit, self.column_exit,
+                              self.allow_collisions, self.obstacles)
+
+    def __str__(self):
+        return f"{self.line_forklift}-{self.column_forklift}\n"
+
+    def __eq__(self, other):
+        if isinstance(other, WarehouseSearchState):
+            return self.line_forklift == other.line_forklift and self.column_forklift == other.column_forklift and (
+                    self.obstacles is other.obstacles or self.obstacles == other.obstacles)
+        return NotImplemented
+
+    def __hash__(self):
+        # frozenset caches its own hash, so this does not depend on the grid size
+        return hash((self.line_forklift, self.column_forklift, self.obstacles))
@@ -0,0 +1,24 @@
+from agentsearch.action import Action
+from warehouse.actions import ActionNoMove
+from warehouse.cell import Cell
+from warehouse.warehouse_problemforSearch import WarehouseProblemSearch
+from warehouse.warehouse_timed_search_state import WarehouseTimedSearchState
+
+
+class WarehouseTimedProblemSearch(WarehouseProblemSearch):
+    # Space-time version of the search problem, every action takes one turn and waiting in place is an action too
+
+    def __init__(self, initial_state: WarehouseTimedSearchState, goal_position: Cell):
+        super().__init__(initial_state, goal_position)
+        self.wait = ActionNoMove()
+
+    def get_actions(self, state: WarehouseTimedSearchState) -> list:
+        valid_actions = super().get_actions(state)
+        if state.can_wait():
+            valid_actions.append(self.wait)
+        return valid_actions
+
+    def get_successor(self, state: WarehouseTimedSearchState, action: Action) -> WarehouseTimedSearchState:
+        successor = super().get_successor(state, action)
+        successor.time += 1
+        return successor
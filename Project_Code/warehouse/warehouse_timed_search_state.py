@@ -0,0 +1,46 @@
+from numpy import ndarray
+
+import constants
+from warehouse.warehouse_search_state import WarehouseSearchState
+
+
+class WarehouseTimedSearchState(WarehouseSearchState):
+    # Search state of space-time replanning: the forklift position after time turns of its own.
+    # occupied[t] holds the cells of the other forklifts before its turn t, as their plans go, and the last set
+    # holds for every later turn. Later times are all the same state, which keeps the search space finite.
+
+    def __init__(self, grid: ndarray, line_forklift: int, column_forklift: int, line_exit: int, column_exit: int,
+                 occupied: [frozenset], time: int = 0):
+        super().__init__(grid, line_forklift, column_forklift, line_exit, column_exit, False)
+        self.occupied = occupied
+        self.time = time
+
+    def get_occupied(self, time: int) -> frozenset:
+        return self.occupied[min(time, len(self.occupied) - 1)]
+
+    def is_movable_cell(self, line: int, column: int) -> bool:
+        # Free at this turn and no other forklift moves in before the next one
+        if (line, column) in self.get_occupied(self.time) or (line, column) in self.get_occupied(self.time + 1):
+            return False
+
+        cell = self.grid[line][column]
+        return cell == constants.EMPTY or cell == constants.EXIT
+
+    def can_wait(self) -> bool:
+        return (self.line_forklift, self.column_forklift) not in self.get_occupied(self.time + 1)
+
+    def __copy__(self) -> "WarehouseTimedSearchState":
+        return self.__class__(self.grid, self.line_forklift, self.column_forklift, self.line_exit, self.column_exit,
+                              self.occupied, self.time)
+
+    def __str__(self):
+        return f"{self.line_forklift}-{self.column_forklift}@{self.time}\n"
+
+    def __eq__(self, other):
+        if isinstance(other, WarehouseTimedSearchState):
+            return self.line_forklift == other.line_forklift and self.column_forklift == other.column_forklift and \
+                min(self.time, len(self.occupied) - 1) == min(other.time, len(other.occupied) - 1)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.line_forklift, self.column_forklift, min(self.time, len(self.occupied) - 1)))